@@ -7,7 +7,6 @@ Just edit config.yaml and run:
 """
 
 import logging
-import json
 from pathlib import Path
 from src import load_config_from_yaml, print_config_summary, run_simulation, generate_report
 
@@ -34,7 +33,12 @@ print("\nRunning simulation...\n")
 metrics = run_simulation(config)
 
 # Generate report and visualizations
-generate_report(config, metrics, output_dir="results")
+generate_report(config, metrics, output_dir="results", generate_plots=config.generate_plots)
+
+# Cost projections (shared by the JSON summary and the console output)
+daily_cost = metrics.total_cost / config.simulation_days
+monthly_cost = daily_cost * 30
+annual_cost = daily_cost * 365
 
 # Save metrics summary as JSON for dashboard
 output_path = Path("results")
@@ -43,9 +47,9 @@ metrics_summary = {
     "warehouse_size": config.warehouse.size,
     "total_dbus": metrics.total_dbus,
     "total_cost": metrics.total_cost,
-    "daily_cost": metrics.total_cost / config.simulation_days,
-    "monthly_cost": metrics.total_cost / config.simulation_days * 30,
-    "annual_cost": metrics.total_cost / config.simulation_days * 365,
+    "daily_cost": daily_cost,
+    "monthly_cost": monthly_cost,
+    "annual_cost": annual_cost,
     "total_queries": metrics.total_queries,
     "dashboard_queries": metrics.dashboard_queries,
     "genie_queries": metrics.genie_queries,
@@ -61,24 +65,35 @@ metrics_summary = {
     "max_queue_depth": metrics.max_queue_depth,
 }
 
-with open(output_path / "metrics_summary.json", 'w') as f:
-    json.dump(metrics_summary, f, indent=2)
+try:
+    import orjson
+    payload = orjson.dumps(metrics_summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+    payload = json.dumps(metrics_summary, indent=2).encode()
+
+# Write to a temp file and rename so readers never see a partial file
+tmp_file = output_path / "metrics_summary.json.tmp"
+tmp_file.write_bytes(payload)
+tmp_file.replace(output_path / "metrics_summary.json")
 
 # Generate dashboards
-print("\n📊 Creating dashboards...")
-try:
-    import subprocess
-    
-    # Charts dashboard
-    subprocess.run(["python", "src/create_dashboard_charts.py"], check=True, capture_output=True)
-    print("✅ Charts dashboard created: results/dashboard_charts.png")
-    
-    # Summary dashboard
-    subprocess.run(["python", "src/create_dashboard_summary.py"], check=True, capture_output=True)
-    print("✅ Summary dashboard created: results/dashboard_summary.png")
-    
-except Exception as e:
-    print(f"⚠️  Could not create dashboards: {e}")
+if config.generate_plots:
+    print("\n📊 Creating dashboards...")
+    try:
+        from src.create_dashboard_charts import render as render_charts
+        from src.create_dashboard_summary import render as render_summary
+        
+        # Charts dashboard
+        render_charts(metrics_summary, output_path)
+        print("✅ Charts dashboard created: results/dashboard_charts.svg (PNG preview alongside)")
+        
+        # Summary dashboard
+        render_summary(metrics_summary, output_path)
+        print("✅ Summary dashboard created: results/dashboard_summary.png")
+        
+    except Exception as e:
+        print(f"⚠️  Could not create dashboards: {e}")
 
 # Print quick summary
 print("\n" + "="*80)
@@ -86,9 +101,9 @@ print("QUICK SUMMARY")
 print("="*80)
 print(f"✓ Simulation complete!")
 print(f"\nTotal Cost ({config.simulation_days} days): ${metrics.total_cost:,.2f}")
-print(f"Daily Cost: ${metrics.total_cost / config.simulation_days:,.2f}")
-print(f"Monthly Projection (30 days): ${metrics.total_cost / config.simulation_days * 30:,.2f}")
-print(f"Annual Projection (365 days): ${metrics.total_cost / config.simulation_days * 365:,.2f}")
+print(f"Daily Cost: ${daily_cost:,.2f}")
+print(f"Monthly Projection (30 days): ${monthly_cost:,.2f}")
+print(f"Annual Projection (365 days): ${annual_cost:,.2f}")
 print(f"\nQueries Executed: {metrics.total_queries:,}")
 print(f"  - Dashboards: {metrics.dashboard_queries:,}")
 print(f"  - Genie: {metrics.genie_queries:,}")
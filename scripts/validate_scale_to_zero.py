@@ -4,7 +4,8 @@ Validation test to ensure warehouse scales to zero correctly.
 """
 
 import logging
-import pandas as pd
+import numpy as np
+from pathlib import Path
 from src.config import SimulationConfig, DashboardConfig, GenieConfig, ServerlessWarehouseConfig, PricingConfig
 from src.simulator import run_simulation
 
@@ -26,7 +27,6 @@ config = SimulationConfig(
         refreshes_per_day=12  # Only twice per day (every 12 hours)
     ),
     genie=GenieConfig(
-        total_users=50,
         peak_concurrent_users_min=2,
         peak_concurrent_users_max=5,
         avg_queries_per_user_per_hour=0.1,  # Very light query rate
@@ -44,7 +44,7 @@ config = SimulationConfig(
 
 print("Configuration:")
 print(f"  - Dashboards: {config.dashboard.num_dashboards} (refresh every 12 hours)")
-print(f"  - Users: {config.genie.total_users} ({config.genie.avg_queries_per_user_per_hour} queries/user/hour)")
+print(f"  - Peak users: {config.genie.peak_concurrent_users_min}-{config.genie.peak_concurrent_users_max} ({config.genie.avg_queries_per_user_per_hour} queries/user/hour)")
 print(f"  - Business hours: {config.genie.business_hours_start}AM - {config.genie.business_hours_end}PM")
 print(f"  - Idle timeout: {config.warehouse.idle_shutdown_seconds}s")
 print(f"  - min_clusters: {config.warehouse.min_clusters}")
@@ -61,31 +61,51 @@ print(f"Total Queries: {metrics.total_queries}")
 print()
 
 # Load state history to analyze cluster behavior
-df = pd.read_csv('results/warehouse_state_history.csv')
+# Prefer the Parquet copy (written when pyarrow is installed), else the CSV
+parquet_file = Path('results/warehouse_state_history.parquet')
+csv_file = Path('results/warehouse_state_history.csv')
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+if pq is not None and parquet_file.exists():
+    table = pq.read_table(parquet_file, columns=['Time (s)', 'Clusters'])
+    times = table.column('Time (s)').to_numpy().astype(np.float64)
+    clusters = table.column('Clusters').to_numpy().astype(np.int64)
+else:
+    with open(csv_file) as f:
+        header = f.readline().rstrip('\n').split(',')
+    data = np.loadtxt(csv_file, delimiter=',', skiprows=1, ndmin=2,
+                      usecols=(header.index('Time (s)'), header.index('Clusters')))
+    times = data[:, 0]
+    clusters = data[:, 1].astype(np.int64)
 
 # Calculate time spent at each cluster count
-cluster_counts = df['Clusters'].value_counts().sort_index()
-total_records = len(df)
+cluster_counts = np.bincount(clusters)
+total_records = len(clusters)
 
 print("Cluster Distribution:")
 print("-" * 80)
 print(f"{'Clusters':<12} {'Records':<12} {'Percentage':<12} {'Status'}")
 print("-" * 60)
 
-for clusters, count in cluster_counts.items():
+for num_clusters in np.flatnonzero(cluster_counts):
+    count = int(cluster_counts[num_clusters])
     percentage = (count / total_records) * 100
     status = ""
-    if clusters == 0:
+    if num_clusters == 0:
         status = "← IDLE (scaled to zero)"
-    elif clusters == 1:
+    elif num_clusters == 1:
         status = "← ACTIVE"
     
-    print(f"{int(clusters):<12} {count:<12} {percentage:>6.1f}%      {status}")
+    print(f"{int(num_clusters):<12} {count:<12} {percentage:>6.1f}%      {status}")
 
 print()
 
 # Check for zero-cluster periods
-zero_cluster_records = (df['Clusters'] == 0).sum()
+zero_cluster_records = int(cluster_counts[0]) if len(cluster_counts) else 0
 zero_cluster_pct = (zero_cluster_records / total_records) * 100
 
 print("Scale to Zero Analysis:")
@@ -140,20 +160,12 @@ print()
 print("Idle Period Analysis:")
 print("-" * 80)
 
-# Find continuous stretches at 0 clusters
-zero_stretches = []
-current_stretch = 0
-
-for i, row in df.iterrows():
-    if row['Clusters'] == 0:
-        current_stretch += 1
-    else:
-        if current_stretch > 0:
-            zero_stretches.append(current_stretch)
-        current_stretch = 0
-
-if current_stretch > 0:
-    zero_stretches.append(current_stretch)
+# Find continuous stretches at 0 clusters (run-length encode the zero mask)
+is_zero = (clusters == 0).astype(np.int8)
+edges = np.diff(np.concatenate(([0], is_zero, [0])))
+starts = np.flatnonzero(edges == 1)
+ends = np.flatnonzero(edges == -1)
+zero_stretches = (ends - starts).tolist()
 
 if zero_stretches:
     max_idle = max(zero_stretches)
@@ -179,14 +191,15 @@ print()
 print("Overnight Analysis (midnight to 6 AM):")
 print("-" * 80)
 
-df['hour'] = (df['Time (s)'] / 3600) % 24
-overnight_df = df[(df['hour'] >= 0) & (df['hour'] < 6)]
+hour = (times / 3600) % 24
+overnight_mask = (hour >= 0) & (hour < 6)
+overnight_records = int(overnight_mask.sum())
 
-if len(overnight_df) > 0:
-    overnight_zero = (overnight_df['Clusters'] == 0).sum()
-    overnight_pct = (overnight_zero / len(overnight_df)) * 100
+if overnight_records > 0:
+    overnight_zero = int(np.count_nonzero(is_zero[overnight_mask]))
+    overnight_pct = (overnight_zero / overnight_records) * 100
     
-    print(f"Overnight records at 0 clusters: {overnight_zero} / {len(overnight_df)} ({overnight_pct:.1f}%)")
+    print(f"Overnight records at 0 clusters: {overnight_zero} / {overnight_records} ({overnight_pct:.1f}%)")
     
     if overnight_pct > 50:
         print(f"✓ PASS: Warehouse scales to 0 during overnight hours ({overnight_pct:.1f}%)")
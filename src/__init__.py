@@ -7,19 +7,29 @@ of Databricks Serverless SQL Warehouse for AI/BI dashboards and Genie queries.
 
 __version__ = "1.0.0"
 
-from .config import SimulationConfig, create_default_config, create_custom_config
+from .config import SimulationConfig, create_default_config, create_custom_config, bypass_validators
 from .config_loader import load_config_from_yaml, print_config_summary
-from .simulator import run_simulation, SimulationMetrics
-from .visualization import generate_report
+from .simulator import run_simulation, run_simulation_sweep, run_simulations_batch, SimulationMetrics
 
 __all__ = [
     "SimulationConfig",
     "create_default_config",
     "create_custom_config",
+    "bypass_validators",
     "load_config_from_yaml",
     "print_config_summary",
     "run_simulation",
+    "run_simulation_sweep",
+    "run_simulations_batch",
     "SimulationMetrics",
     "generate_report",
 ]
 
+
+def __getattr__(name):
+    # Import the matplotlib-based reporting lazily, so scripts that only
+    # run simulations do not pay matplotlib's import cost
+    if name == "generate_report":
+        from .visualization import generate_report
+        return generate_report
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
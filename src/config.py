@@ -2,12 +2,56 @@
 Configuration parameters for Databricks Serverless SQL Warehouse simulation.
 """
 
-from dataclasses import dataclass, field
-from typing import Dict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, replace, MISSING
+from types import MappingProxyType
+from typing import Dict, Mapping
 import numpy as np
 
 
-@dataclass
+# When set, __post_init__ skips its assertions (see bypass_validators)
+_BYPASS_VALIDATORS = False
+
+
+# Fields whose assignment invalidates the cached derived values below
+_SIMULATION_DERIVED_FROM = frozenset({"simulation_days", "time_step_seconds"})
+
+
+# DBU rates per cluster size (DBUs per hour per cluster)
+# Based on actual Databricks SQL Serverless warehouse sizing for AWS Enterprise
+# Source: https://www.databricks.com/product/pricing/product-pricing/instance-types
+SIZE_DBU_MAPPING: Mapping[str, float] = MappingProxyType({
+    "2XSmall": 4.0,     # 2X-Small: 4 DBUs/hour per cluster
+    "XSmall": 6.0,      # X-Small: 6 DBUs/hour per cluster
+    "Small": 12.0,      # Small: 12 DBUs/hour per cluster
+    "Medium": 24.0,     # Medium: 24 DBUs/hour per cluster (default)
+    "Large": 40.0,      # Large: 40 DBUs/hour per cluster
+    "XLarge": 80.0,     # X-Large: 80 DBUs/hour per cluster
+    "2XLarge": 144.0,   # 2X-Large: 144 DBUs/hour per cluster
+    "3XLarge": 272.0,   # 3X-Large: 272 DBUs/hour per cluster
+    "4XLarge": 528.0,   # 4X-Large: 528 DBUs/hour per cluster
+})
+
+
+@contextmanager
+def bypass_validators():
+    """
+    Skip the __post_init__ assertions of configs built inside this block.
+    
+    Only use this when the values are already known to be valid, e.g. when
+    rebuilding a copy of a config that passed validation. Derived values are
+    still computed.
+    """
+    global _BYPASS_VALIDATORS
+    previous = _BYPASS_VALIDATORS
+    _BYPASS_VALIDATORS = True
+    try:
+        yield
+    finally:
+        _BYPASS_VALIDATORS = previous
+
+
+@dataclass(slots=True)
 class DashboardConfig:
     """Configuration for dashboard refresh workload."""
     
@@ -26,12 +70,14 @@ class DashboardConfig:
     
     def __post_init__(self):
         """Validate configuration."""
+        if _BYPASS_VALIDATORS:
+            return
         assert self.num_dashboards > 0, "Must have at least one dashboard"
         assert self.refreshes_per_day > 0, "Must have at least one refresh per day"
         assert self.avg_refresh_runtime > 0, "Average runtime must be positive"
 
 
-@dataclass
+@dataclass(slots=True)
 class GenieConfig:
     """Configuration for Genie interactive query workload."""
     
@@ -60,32 +106,23 @@ class GenieConfig:
     
     def __post_init__(self):
         """Validate configuration."""
+        if _BYPASS_VALIDATORS:
+            return
         assert 0 <= self.cache_hit_rate <= 1, "Cache hit rate must be between 0 and 1"
         assert self.peak_concurrent_users_min <= self.peak_concurrent_users_max, \
             "Peak concurrent min must be <= max"
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerlessWarehouseConfig:
     """Configuration for Serverless SQL Warehouse."""
     
     # T-shirt size and corresponding DBUs per hour per cluster
     size: str = "XSmall"
     
-    # DBU rates per cluster size (DBUs per hour per cluster)
-    # Based on actual Databricks SQL Serverless warehouse sizing for AWS Enterprise
-    # Source: https://www.databricks.com/product/pricing/product-pricing/instance-types
-    size_dbu_mapping: Dict[str, float] = field(default_factory=lambda: {
-        "2XSmall": 4.0,     # 2X-Small: 4 DBUs/hour per cluster
-        "XSmall": 6.0,      # X-Small: 6 DBUs/hour per cluster
-        "Small": 12.0,      # Small: 12 DBUs/hour per cluster
-        "Medium": 24.0,     # Medium: 24 DBUs/hour per cluster (default)
-        "Large": 40.0,      # Large: 40 DBUs/hour per cluster
-        "XLarge": 80.0,     # X-Large: 80 DBUs/hour per cluster
-        "2XLarge": 144.0,   # 2X-Large: 144 DBUs/hour per cluster
-        "3XLarge": 272.0,   # 3X-Large: 272 DBUs/hour per cluster
-        "4XLarge": 528.0,   # 4X-Large: 528 DBUs/hour per cluster
-    })
+    # DBU rates per cluster size (DBUs per hour per cluster); each config
+    # gets its own copy of the module-level table
+    size_dbu_mapping: Dict[str, float] = field(default_factory=lambda: dict(SIZE_DBU_MAPPING))
     
     # Target concurrency per cluster before scaling up
     target_concurrency_per_cluster: int = 4
@@ -105,6 +142,8 @@ class ServerlessWarehouseConfig:
     @property
     def dbus_per_hour(self) -> float:
         """Get DBUs per hour for the configured size."""
+        # Looked up on access so in-place edits of size_dbu_mapping are seen;
+        # the simulator copies it out once per run
         return self.size_dbu_mapping.get(self.size, 24.0)
     
     @property
@@ -127,15 +166,15 @@ class ServerlessWarehouseConfig:
         
         # Ensure at least 2 concurrent queries
         return max(2, adjusted_concurrency)
-
     
     def __post_init__(self):
         """Validate configuration."""
-        assert self.size in self.size_dbu_mapping, f"Unknown size: {self.size}"
-        assert self.target_concurrency_per_cluster > 0, "Target concurrency must be positive"
+        if not _BYPASS_VALIDATORS:
+            assert self.size in self.size_dbu_mapping, f"Unknown size: {self.size}"
+            assert self.target_concurrency_per_cluster > 0, "Target concurrency must be positive"
 
 
-@dataclass
+@dataclass(slots=True)
 class PricingConfig:
     """Pricing configuration."""
     
@@ -144,10 +183,12 @@ class PricingConfig:
     
     def __post_init__(self):
         """Validate configuration."""
+        if _BYPASS_VALIDATORS:
+            return
         assert self.sql_serverless_dbu_rate > 0, "DBU rate must be positive"
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
     """Overall simulation configuration."""
     
@@ -164,27 +205,79 @@ class SimulationConfig:
     enable_progress_logging: bool = True  # Print progress updates during simulation
     progress_log_interval: int = 10000  # Print progress every N queries processed
     
+    # Reporting
+    generate_plots: bool = True  # Render charts and dashboards after the run
+    
     # Component configurations
     dashboard: DashboardConfig = field(default_factory=DashboardConfig)
     genie: GenieConfig = field(default_factory=GenieConfig)
     warehouse: ServerlessWarehouseConfig = field(default_factory=ServerlessWarehouseConfig)
     pricing: PricingConfig = field(default_factory=PricingConfig)
     
+    # Derived values, cached by __post_init__
+    _total_seconds: int = field(init=False, repr=False, compare=False)
+    _num_steps: int = field(init=False, repr=False, compare=False)
+    
     @property
     def total_seconds(self) -> int:
         """Total simulation duration in seconds."""
-        return self.simulation_days * 24 * 3600
+        return self._total_seconds
     
     @property
     def num_steps(self) -> int:
         """Number of simulation time steps."""
-        return int(self.total_seconds / self.time_step_seconds)
+        return self._num_steps
+    
+    def _update_derived(self):
+        """Recompute the cached duration and step count."""
+        total_seconds = self.simulation_days * 24 * 3600
+        object.__setattr__(self, '_total_seconds', total_seconds)
+        object.__setattr__(self, '_num_steps', int(total_seconds / self.time_step_seconds))
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # Keep the cached values in sync when a config is mutated after construction
+        if name in _SIMULATION_DERIVED_FROM and hasattr(self, '_total_seconds'):
+            self._update_derived()
     
     def __post_init__(self):
-        """Validate configuration and set random seed."""
-        assert self.simulation_days > 0, "Must simulate at least 1 day"
-        assert self.time_step_seconds > 0, "Time step must be positive"
-        np.random.seed(self.random_seed)
+        """Validate configuration."""
+        if not _BYPASS_VALIDATORS:
+            assert self.simulation_days > 0, "Must simulate at least 1 day"
+            assert self.time_step_seconds > 0, "Time step must be positive"
+        self._update_derived()
+    
+    def make_rng(self) -> np.random.Generator:
+        """Create a random generator seeded from random_seed."""
+        return np.random.default_rng(self.random_seed)
+    
+    @classmethod
+    def from_validated(cls, **kwargs) -> "SimulationConfig":
+        """
+        Build a config from known-valid values without running __init__.
+        
+        Unspecified fields take their defaults. Skips the validation done
+        in __post_init__.
+        
+        Args:
+            **kwargs: Field values, as accepted by the constructor
+        
+        Returns:
+            SimulationConfig object
+        """
+        config = object.__new__(cls)
+        for f in fields(cls):
+            if not f.init:
+                continue
+            if f.name in kwargs:
+                value = kwargs[f.name]
+            elif f.default is not MISSING:
+                value = f.default
+            else:
+                value = f.default_factory()
+            object.__setattr__(config, f.name, value)
+        config._update_derived()
+        return config
 
 
 def create_default_config() -> SimulationConfig:
@@ -209,23 +302,34 @@ def create_custom_config(
         dbu_rate: SQL Serverless DBU rate
         simulation_days: Number of days to simulate
     """
-    config = SimulationConfig()
-    
+    # Build each section with its overrides so the user-supplied values
+    # go through the same validation as any other config
+    dashboard = DashboardConfig()
     if num_dashboards is not None:
-        config.dashboard.num_dashboards = num_dashboards
+        dashboard = replace(dashboard, num_dashboards=num_dashboards)
     
+    genie = GenieConfig()
     if peak_concurrent_users is not None:
-        config.genie.peak_concurrent_users_min = peak_concurrent_users[0]
-        config.genie.peak_concurrent_users_max = peak_concurrent_users[1]
+        genie = replace(genie,
+                        peak_concurrent_users_min=peak_concurrent_users[0],
+                        peak_concurrent_users_max=peak_concurrent_users[1])
     
+    warehouse = ServerlessWarehouseConfig()
     if warehouse_size is not None:
-        config.warehouse.size = warehouse_size
+        warehouse = replace(warehouse, size=warehouse_size)
     
+    pricing = PricingConfig()
     if dbu_rate is not None:
-        config.pricing.sql_serverless_dbu_rate = dbu_rate
-    
+        pricing = replace(pricing, sql_serverless_dbu_rate=dbu_rate)
+    
+    config = SimulationConfig.from_validated(
+        dashboard=dashboard,
+        genie=genie,
+        warehouse=warehouse,
+        pricing=pricing
+    )
     if simulation_days is not None:
-        config.simulation_days = simulation_days
+        config = replace(config, simulation_days=simulation_days)
     
     return config
 
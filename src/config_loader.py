@@ -2,9 +2,17 @@
 Configuration loader for YAML-based configuration.
 """
 
+import os
 import yaml
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 from .config import (
     SimulationConfig,
@@ -14,6 +22,35 @@ from .config import (
     PricingConfig
 )
 
+# Parsed YAML documents keyed by resolved path, validated by (mtime, size)
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, dict]]" = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
+
+
+def read_yaml_cached(yaml_file: Path) -> dict:
+    """
+    Parse a YAML file, reusing the previous parse if the file is unchanged.
+    
+    The returned dict is shared with the cache and must be treated as read-only.
+    """
+    key = str(Path(yaml_file).resolve())
+    stat = os.stat(key)
+    
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        _YAML_CACHE.move_to_end(key)
+        return cached[2]
+    
+    with open(key, 'r') as f:
+        config_dict = yaml.load(f, Loader=SafeLoader) or {}
+    
+    _YAML_CACHE[key] = (stat.st_mtime, stat.st_size, config_dict)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+        _YAML_CACHE.popitem(last=False)
+    
+    return config_dict
+
 
 def load_config_from_yaml(yaml_path: str = "config.yaml") -> SimulationConfig:
     """
@@ -33,8 +70,7 @@ def load_config_from_yaml(yaml_path: str = "config.yaml") -> SimulationConfig:
             f"Please create a config.yaml file or specify a valid path."
         )
     
-    with open(yaml_file, 'r') as f:
-        config_dict = yaml.safe_load(f)
+    config_dict = read_yaml_cached(yaml_file)
     
     # Extract sections
     sim = config_dict.get('simulation', {})
@@ -93,6 +129,7 @@ def load_config_from_yaml(yaml_path: str = "config.yaml") -> SimulationConfig:
         random_seed=sim.get('random_seed', 42),
         enable_progress_logging=sim.get('enable_progress_logging', True),
         progress_log_interval=sim.get('progress_log_interval', 10000),
+        generate_plots=sim.get('generate_plots', True),
         dashboard=dashboard_config,
         genie=genie_config,
         warehouse=warehouse_config,
@@ -2,13 +2,30 @@
 Create the charts-only view of the simulation dashboard.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+# pandas and matplotlib are imported when a dashboard is drawn, so importing
+# this module (e.g. to register a command) stays cheap
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Dashboard style (applied per render so importing this module has no side effects)
+STYLE = 'seaborn-v0_8-darkgrid'
+
+# The dashboard is saved as SVG, plus a lower resolution PNG preview for
+# viewers and markdown that need a raster image
+PNG_PREVIEW_DPI = 100
+
+# State history columns drawn by the panels
+STATE_COLUMNS = ['Time (hours)', 'Clusters', 'Utilization (%)', 'Active Queries',
+                 'Capacity', 'Queued Queries', 'Cumulative DBUs', 'Cumulative Cost ($)']
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
 colors = {
     'primary': '#2E86AB',
     'secondary': '#A23B72', 
@@ -18,30 +35,132 @@ colors = {
     'info': '#4ECDC4'
 }
 
-def create_charts_dashboard():
-    """Create a clean charts-only dashboard."""
+# Axis label styling shared by the panels
+_LABEL_KW = {'fontsize': 11, 'fontweight': 'bold'}
+
+
+def filled_line(ax, x, y, color: str, linewidth: float = 2, label: Optional[str] = None):
+    """
+    Draw y as a solid line over a translucent area down to zero.
+    
+    The outline is a separate line rather than the fill's edge, which would
+    also stroke the baseline and the closing vertical edges.
+    """
+    ax.plot(x, y, linewidth=linewidth, color=color, label=label)
+    ax.fill_between(x, y, color=color, alpha=0.3, edgecolor='none')
+
+
+def style_panel(ax, ylabel: str, title: str, xlabel: str = 'Time (hours)'):
+    """Apply the shared axis labels, title and grid styling of the smaller panels."""
+    ax.set_xlabel(xlabel, **_LABEL_KW)
+    ax.set_ylabel(ylabel, **_LABEL_KW)
+    ax.set_title(title, fontsize=13, fontweight='bold', pad=10)
+    ax.grid(True, alpha=0.3)
+
+
+def _is_up_to_date(output_file: Path, input_files) -> bool:
+    """Check whether output_file exists and is newer than every existing input file."""
+    if not output_file.exists():
+        return False
+    output_mtime = output_file.stat().st_mtime
+    return all(f.stat().st_mtime <= output_mtime for f in input_files if f.exists())
+
+
+def create_charts_dashboard(output_path: Path = Path('results'), force: bool = False):
+    """
+    Create a clean charts-only dashboard from the files in output_path.
+    
+    Args:
+        output_path: Results directory containing the simulation outputs
+        force: Redraw even if the existing dashboard is newer than its inputs
+    """
+    output_path = Path(output_path)
+    output_file = output_path / 'dashboard_charts.svg'
+    inputs = [
+        output_path / 'warehouse_state_history.csv',
+        output_path / 'warehouse_state_history.parquet',
+        output_path / 'metrics_summary.json',
+        Path(__file__),
+    ]
+    if not force and _is_up_to_date(output_file, inputs):
+        print(f'✅ Charts dashboard is up to date: {output_file}')
+        return
+    
+    try:
+        with open(output_path / 'metrics_summary.json', 'rb') as f:
+            metrics_summary = json_loads(f.read())
+    except Exception:
+        metrics_summary = None
+    
+    render(metrics_summary, output_path)
+    print(f'✅ Created charts dashboard: {output_file}')
+
+
+def render(metrics_summary: Optional[dict], output_path: Path) -> None:
+    """
+    Render the charts dashboard to output_path/dashboard_charts.svg and .png.
+    
+    Args:
+        metrics_summary: Metrics summary dict (as written to metrics_summary.json),
+            or None if unavailable
+        output_path: Results directory containing warehouse_state_history.csv
+    """
+    from matplotlib import style
+    
+    with style.context(STYLE):
+        _render(metrics_summary, Path(output_path))
+
+
+def _render(metrics: Optional[dict], output_path: Path) -> None:
+    """Build and save the charts figure."""
+    # A bare Figure renders with Agg and never touches pyplot's GUI backend
+    from matplotlib.figure import Figure
+    from .visualization import downsample, load_state_history
     
     # Load data
-    df = pd.read_csv('results/warehouse_state_history.csv')
+    # Single precision is plenty for plotting
+    df = load_state_history(output_path, STATE_COLUMNS, np.float32)
+    
+    # Extract each column once; summary statistics use every row
+    all_clusters = df['Clusters'].to_numpy()
+    clusters_max = all_clusters.max()
+    is_zero = all_clusters == 0
+    zero_count = int(is_zero.sum())
+    has_zero = zero_count > 0
+    zero_pct = 100.0 * zero_count / all_clusters.size
+    avg_clusters = all_clusters.mean()
+    queued_max = df['Queued Queries'].to_numpy().max()
+    
+    # The plotted series are thinned the same way as the report charts: the
+    # min/max envelope keeps one-minute spikes, while the cumulative series
+    # only need evenly spaced samples
+    all_times = df['Time (hours)'].to_numpy()
+    times, clusters = downsample(all_times, all_clusters, envelope=True)
+    _, util = downsample(all_times, df['Utilization (%)'].to_numpy(), envelope=True)
+    _, active = downsample(all_times, df['Active Queries'].to_numpy(), envelope=True)
+    _, capacity = downsample(all_times, df['Capacity'].to_numpy(), envelope=True)
+    _, queued = downsample(all_times, df['Queued Queries'].to_numpy(), envelope=True)
+    cumulative_times, dbus = downsample(all_times, df['Cumulative DBUs'].to_numpy())
+    _, cost = downsample(all_times, df['Cumulative Cost ($)'].to_numpy())
     
     # Create figure
-    fig = plt.figure(figsize=(24, 14))
+    fig = Figure(figsize=(24, 14))
     gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
     
-    times = df['Time (hours)']
-    
     # ========================================================================
     # PANEL 1: Cluster Count with Zero Highlighting
     # ========================================================================
     ax1 = fig.add_subplot(gs[0, :])
-    ax1.plot(times, df['Clusters'], linewidth=2, color=colors['primary'], label='Active Clusters')
-    ax1.fill_between(times, df['Clusters'], alpha=0.3, color=colors['primary'])
+    filled_line(ax1, times, clusters, colors['primary'], label='Active Clusters')
     
-    # Highlight zero periods
-    zero_mask = df['Clusters'] == 0
-    if zero_mask.any():
-        ax1.fill_between(times, 0, df['Clusters'].max() + 0.5, 
-                        where=zero_mask, alpha=0.2, color='red', label='Scaled to Zero')
+    # Highlight zero periods, one span per contiguous run at full resolution
+    if has_zero:
+        edges = np.diff(is_zero.astype(np.int8), prepend=0, append=0)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.minimum(np.flatnonzero(edges == -1), len(all_times) - 1)
+        for i, (start, end) in enumerate(zip(all_times[run_starts], all_times[run_ends])):
+            ax1.axvspan(start, end, alpha=0.2, color='red',
+                        label='Scaled to Zero' if i == 0 else None)
     
     ax1.axhline(y=0, color='red', linestyle='--', linewidth=2, alpha=0.7)
     ax1.set_xlabel('Time (hours)', fontsize=12, fontweight='bold')
@@ -50,11 +169,9 @@ def create_charts_dashboard():
                   fontsize=15, fontweight='bold', pad=15)
     ax1.legend(loc='upper right', fontsize=11)
     ax1.grid(True, alpha=0.3)
-    ax1.set_ylim(-0.3, df['Clusters'].max() + 0.5)
+    ax1.set_ylim(-0.3, clusters_max + 0.5)
     
     # Add statistics box
-    zero_pct = (zero_mask.sum() / len(df)) * 100
-    avg_clusters = df['Clusters'].mean()
     textstr = f'Avg Clusters: {avg_clusters:.2f}\nZero Time: {zero_pct:.1f}%'
     props = dict(boxstyle='round', facecolor='wheat', alpha=0.8)
     ax1.text(0.02, 0.98, textstr, transform=ax1.transAxes, fontsize=11,
@@ -64,9 +181,7 @@ def create_charts_dashboard():
     # PANEL 2: Utilization with Thresholds
     # ========================================================================
     ax2 = fig.add_subplot(gs[1, 0])
-    ax2.plot(times, df['Utilization (%)'], linewidth=2, color=colors['success'], 
-             label='Utilization')
-    ax2.fill_between(times, df['Utilization (%)'], alpha=0.3, color=colors['success'])
+    filled_line(ax2, times, util, colors['success'], label='Utilization')
     
     # Add threshold lines
     ax2.axhline(y=80, color='orange', linestyle='--', linewidth=1.5, 
@@ -74,69 +189,49 @@ def create_charts_dashboard():
     ax2.axhline(y=30, color='blue', linestyle='--', linewidth=1.5, 
                 alpha=0.7, label='Scale-Down (30%)')
     
-    ax2.set_xlabel('Time (hours)', fontsize=11, fontweight='bold')
-    ax2.set_ylabel('Utilization (%)', fontsize=11, fontweight='bold')
-    ax2.set_title('Warehouse Utilization', fontsize=13, fontweight='bold', pad=10)
+    style_panel(ax2, 'Utilization (%)', 'Warehouse Utilization')
     ax2.legend(loc='upper right', fontsize=9)
-    ax2.grid(True, alpha=0.3)
     ax2.set_ylim(-5, 105)
     
     # ========================================================================
     # PANEL 3: Active Queries vs Capacity
     # ========================================================================
     ax3 = fig.add_subplot(gs[1, 1])
-    ax3.plot(times, df['Active Queries'], linewidth=2, color=colors['primary'], 
-             label='Active Queries')
-    ax3.plot(times, df['Capacity'], linewidth=2, linestyle='--', 
+    filled_line(ax3, times, active, colors['primary'], label='Active Queries')
+    ax3.plot(times, capacity, linewidth=2, linestyle='--', 
              color=colors['success'], label='Total Capacity', alpha=0.8)
-    ax3.fill_between(times, df['Active Queries'], alpha=0.3, color=colors['primary'])
     
-    ax3.set_xlabel('Time (hours)', fontsize=11, fontweight='bold')
-    ax3.set_ylabel('Query Count', fontsize=11, fontweight='bold')
-    ax3.set_title('Active Queries vs Capacity', fontsize=13, fontweight='bold', pad=10)
+    style_panel(ax3, 'Query Count', 'Active Queries vs Capacity')
     ax3.legend(loc='upper right', fontsize=9)
-    ax3.grid(True, alpha=0.3)
     
     # ========================================================================
     # PANEL 4: Queue Depth
     # ========================================================================
     ax4 = fig.add_subplot(gs[1, 2])
-    ax4.plot(times, df['Queued Queries'], linewidth=2, color=colors['warning'])
-    ax4.fill_between(times, df['Queued Queries'], alpha=0.3, color=colors['warning'])
+    filled_line(ax4, times, queued, colors['warning'])
     
-    if df['Queued Queries'].max() > 10:
+    if queued_max > 10:
         ax4.axhline(y=10, color='red', linestyle='--', linewidth=1.5, 
                     alpha=0.7, label='High Queue Warning')
         ax4.legend(loc='upper right', fontsize=9)
     
-    ax4.set_xlabel('Time (hours)', fontsize=11, fontweight='bold')
-    ax4.set_ylabel('Queued Queries', fontsize=11, fontweight='bold')
-    ax4.set_title('Query Queue Depth', fontsize=13, fontweight='bold', pad=10)
-    ax4.grid(True, alpha=0.3)
+    style_panel(ax4, 'Queued Queries', 'Query Queue Depth')
     
     # ========================================================================
     # PANEL 5: DBU Consumption
     # ========================================================================
     ax5 = fig.add_subplot(gs[2, 0])
-    ax5.plot(times, df['Cumulative DBUs'], linewidth=2.5, color=colors['secondary'])
-    ax5.fill_between(times, df['Cumulative DBUs'], alpha=0.3, color=colors['secondary'])
+    filled_line(ax5, cumulative_times, dbus, colors['secondary'], linewidth=2.5)
     
-    ax5.set_xlabel('Time (hours)', fontsize=11, fontweight='bold')
-    ax5.set_ylabel('Cumulative DBUs', fontsize=11, fontweight='bold')
-    ax5.set_title('DBU Consumption Over Time', fontsize=13, fontweight='bold', pad=10)
-    ax5.grid(True, alpha=0.3)
+    style_panel(ax5, 'Cumulative DBUs', 'DBU Consumption Over Time')
     
     # ========================================================================
     # PANEL 6: Cost Accumulation
     # ========================================================================
     ax6 = fig.add_subplot(gs[2, 1])
-    ax6.plot(times, df['Cumulative Cost ($)'], linewidth=2.5, color=colors['danger'])
-    ax6.fill_between(times, df['Cumulative Cost ($)'], alpha=0.3, color=colors['danger'])
+    filled_line(ax6, cumulative_times, cost, colors['danger'], linewidth=2.5)
     
-    ax6.set_xlabel('Time (hours)', fontsize=11, fontweight='bold')
-    ax6.set_ylabel('Cumulative Cost ($)', fontsize=11, fontweight='bold')
-    ax6.set_title('Cost Accumulation', fontsize=13, fontweight='bold', pad=10)
-    ax6.grid(True, alpha=0.3)
+    style_panel(ax6, 'Cumulative Cost ($)', 'Cost Accumulation')
     
     # ========================================================================
     # PANEL 7: Wait Time Distribution
@@ -144,10 +239,6 @@ def create_charts_dashboard():
     ax7 = fig.add_subplot(gs[2, 2])
     
     try:
-        import json
-        with open('results/metrics_summary.json', 'r') as f:
-            metrics = json.load(f)
-        
         genie_avg = metrics['genie_avg_wait_time']
         genie_p50 = metrics['genie_p50_wait_time']
         genie_p95 = metrics['genie_p95_wait_time']
@@ -156,17 +247,10 @@ def create_charts_dashboard():
         categories = ['Avg', 'P50', 'P95', 'P99']
         values = [genie_avg, genie_p50, genie_p95, genie_p99]
         
-        # Color bars based on performance
-        bar_colors = []
-        for val in values:
-            if val < 2:
-                bar_colors.append(colors['success'])
-            elif val < 5:
-                bar_colors.append(colors['info'])
-            elif val < 10:
-                bar_colors.append(colors['warning'])
-            else:
-                bar_colors.append(colors['danger'])
+        # Color bars based on performance: < 2s, < 5s, < 10s, and slower
+        thresholds = np.array([2.0, 5.0, 10.0])
+        palette = [colors['success'], colors['info'], colors['warning'], colors['danger']]
+        bar_colors = [palette[i] for i in np.searchsorted(thresholds, values, side='right')]
         
         bars = ax7.bar(categories, values, color=bar_colors, alpha=0.8, 
                       edgecolor='black', linewidth=1.5)
@@ -178,7 +262,7 @@ def create_charts_dashboard():
                     f'{val:.2f}s', ha='center', va='bottom', 
                     fontsize=10, fontweight='bold')
         
-        ax7.set_ylabel('Wait Time (seconds)', fontsize=11, fontweight='bold')
+        ax7.set_ylabel('Wait Time (seconds)', **_LABEL_KW)
         ax7.set_title('Genie Wait Time Percentiles', fontsize=13, fontweight='bold', pad=10)
         ax7.grid(True, alpha=0.3, axis='y')
         
@@ -202,18 +286,14 @@ def create_charts_dashboard():
     fig.suptitle('Databricks Serverless SQL Warehouse - Simulation Charts', 
                  fontsize=18, fontweight='bold', y=0.995)
     
-    from datetime import datetime
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     fig.text(0.5, 0.005, f'Generated: {timestamp}', 
              ha='center', fontsize=9, style='italic', color='gray')
     
     # Save
-    plt.savefig('results/dashboard_charts.png', dpi=200, bbox_inches='tight')
-    print('✅ Created charts dashboard: results/dashboard_charts.png')
-    
-    return fig
+    fig.savefig(output_path / 'dashboard_charts.svg')
+    fig.savefig(output_path / 'dashboard_charts.png', dpi=PNG_PREVIEW_DPI)
 
 if __name__ == '__main__':
     create_charts_dashboard()
-    plt.close()
 
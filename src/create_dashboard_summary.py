@@ -2,44 +2,182 @@
 Create the summary statistics view of the simulation dashboard.
 """
 
-import matplotlib.pyplot as plt
+import io
+import json
+from matplotlib import style
+from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
-import pandas as pd
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.font_manager import FontProperties
 import numpy as np
-import yaml
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-# Set style
-plt.style.use('seaborn-v0_8-whitegrid')
+from .config import SIZE_DBU_MAPPING
+from .config_loader import read_yaml_cached
+from .visualization import load_state_history
 
-def create_summary_dashboard():
-    """Create a clean summary statistics dashboard."""
+# Dashboard style (applied per render so importing this module has no side effects)
+STYLE = 'seaborn-v0_8-whitegrid'
+
+# State history columns used by the summary tables
+STATE_COLUMNS = ['Clusters', 'Queued Queries']
+
+# Table colors, converted to RGBA once
+BLANK_ROW_COLOR = to_rgba('#F0F0F0')
+WHITE = to_rgba('white')
+BLACK = to_rgba('black')
+
+# Per-table colors: section header band, highlighted rows and (optionally) their value text
+INPUTS_PALETTE = {'header': to_rgba('#2E86AB')}
+COSTS_PALETTE = {'header': to_rgba('#A23B72'), 'highlight': to_rgba('#FFF3CD'),
+                 'highlight_text': to_rgba('#856404')}
+PERF_PALETTE = {'header': to_rgba('#06A77D'), 'highlight': to_rgba('#FFF9E6')}
+
+# Spacer row between table sections
+BLANK_ROW = ('', '', 'blank')
+
+# Table layout in axes coordinates: label column width, text inset as a
+# fraction of the column width, and the number of rows spanning one panel
+LABEL_COLUMN_WIDTH = 0.55
+CELL_TEXT_INSET = 0.1
+PANEL_ROWS = 25
+LABEL_X = LABEL_COLUMN_WIDTH * CELL_TEXT_INSET
+VALUE_X = LABEL_COLUMN_WIDTH + (1 - LABEL_COLUMN_WIDTH) * CELL_TEXT_INSET
+
+# Fonts, built once so every cell reuses the same resolved properties
+CELL_FONT = FontProperties(size=11)
+BOLD_FONT = FontProperties(size=11, weight='bold')
+HEADER_FONT = FontProperties(size=12, weight='bold')
+
+# Text styles
+CELL_TEXT = {'fontproperties': CELL_FONT, 'va': 'center', 'clip_on': False}
+BOLD_TEXT = {**CELL_TEXT, 'fontproperties': BOLD_FONT}
+HEADER_TEXT = {**CELL_TEXT, 'fontproperties': HEADER_FONT, 'color': WHITE}
+STATUS_TEXT = {**BOLD_TEXT, 'color': WHITE}
+
+
+def _fill_row(ax, i, color, xmin=0.0):
+    ax.axhspan(i, i + 1, xmin=xmin, facecolor=color, linewidth=0, clip_on=False)
+
+
+def _style_header(ax, i, label, value, palette):
+    _fill_row(ax, i, palette['header'])
+    ax.text(LABEL_X, i + 0.5, label, **HEADER_TEXT)
+
+
+def _style_kv(ax, i, label, value, palette):
+    ax.text(LABEL_X, i + 0.5, label, **BOLD_TEXT)
+    ax.text(VALUE_X, i + 0.5, value, **CELL_TEXT)
+
+
+def _style_highlight(ax, i, label, value, palette):
+    _fill_row(ax, i, palette['highlight'])
+    ax.text(LABEL_X, i + 0.5, label, **BOLD_TEXT)
+    if 'highlight_text' in palette:
+        ax.text(VALUE_X, i + 0.5, value, **BOLD_TEXT, color=palette['highlight_text'])
+    else:
+        ax.text(VALUE_X, i + 0.5, value, **BOLD_TEXT)
+
+
+def _style_status(ax, i, label, value, palette):
+    _fill_row(ax, i, palette['status'], xmin=LABEL_COLUMN_WIDTH)
+    ax.text(LABEL_X, i + 0.5, label, **BOLD_TEXT)
+    ax.text(VALUE_X, i + 0.5, value, **STATUS_TEXT)
+
+
+# Row role -> row drawing (blank rows are filled together in _draw_table)
+ROW_STYLES = {
+    'header': _style_header,
+    'kv': _style_kv,
+    'highlight': _style_highlight,
+    'status': _style_status,
+}
+
+
+def _draw_table(ax, rows, palette):
+    """
+    Draw (label, value, role) rows as a two-column table styled by role.
+    
+    Rows are drawn straight onto ax as row bands, text and one set of cell
+    borders, which is much cheaper to lay out and draw than a matplotlib
+    Table. Row i spans y in [i, i + 1] and the table is centered in ax.
+    Blank spacer rows add no artists of their own; their bands are a single
+    collection.
+    """
+    blank_rows = []
+    for i, (label, value, role) in enumerate(rows):
+        if role == 'blank':
+            blank_rows.append(i)
+        else:
+            ROW_STYLES[role](ax, i, label, value, palette)
+    
+    ax.add_collection(PolyCollection(
+        [[(0, i), (1, i), (1, i + 1), (0, i + 1)] for i in blank_rows],
+        facecolors=BLANK_ROW_COLOR, linewidths=0, clip_on=False
+    ), autolim=False)
+    
+    num_rows = len(rows)
+    ax.hlines(np.arange(num_rows + 1), 0, 1, colors=BLACK, linewidth=1, clip_on=False)
+    ax.vlines([0, LABEL_COLUMN_WIDTH, 1], 0, num_rows, colors=BLACK, linewidth=1, clip_on=False)
+    
+    ax.set_xlim(0, 1)
+    ax.set_ylim((num_rows + PANEL_ROWS) / 2, (num_rows - PANEL_ROWS) / 2)
+
+
+def create_summary_dashboard(output_path: Path = Path('results')):
+    """Create a clean summary statistics dashboard from the files in output_path."""
+    try:
+        with open(output_path / 'metrics_summary.json', 'r') as f:
+            metrics_summary = json.load(f)
+    except:
+        metrics_summary = None
+    
+    render(metrics_summary, output_path)
+    print(f'✅ Created summary dashboard: {output_path / "dashboard_summary.png"}')
+
+
+def render(metrics_summary: Optional[dict], output_path: Path) -> None:
+    """
+    Render the summary dashboard to output_path/dashboard_summary.png.
+    
+    Args:
+        metrics_summary: Metrics summary dict (as written to metrics_summary.json),
+            or None if unavailable
+        output_path: Results directory containing warehouse_state_history.csv
+    """
+    with style.context(STYLE):
+        _render(metrics_summary, Path(output_path))
+
+
+def _render(metrics_summary: Optional[dict], output_path: Path) -> None:
+    """Build and save the summary figure."""
     
     # Load data
-    df = pd.read_csv('results/warehouse_state_history.csv')
+    df = load_state_history(output_path, STATE_COLUMNS, np.int32)
     
     # Load config for inputs
     try:
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        config = read_yaml_cached(Path('config.yaml'))
         config_loaded = True
     except:
         config_loaded = False
         print("Warning: Could not load config.yaml")
     
-    # Load metrics for results
-    try:
-        import json
-        with open('results/metrics_summary.json', 'r') as f:
-            metrics = json.load(f)
-        metrics_loaded = True
-    except:
-        metrics_loaded = False
+    # Metrics for results
+    metrics = metrics_summary
+    metrics_loaded = metrics is not None
+    if not metrics_loaded:
         print("Warning: Could not load metrics_summary.json")
     
     # Create figure with 3 columns
-    fig = plt.figure(figsize=(24, 12))
-    gs = fig.add_gridspec(3, 3, hspace=0.4, wspace=0.3)
+    # Fixed gridspec margins and no layout engine, so nothing is measured
+    # before the single draw at save time (constrained_layout=False leaves
+    # none on matplotlib >= 3.6 and also works on 3.5)
+    fig = Figure(figsize=(24, 12), constrained_layout=False)
+    gs = fig.add_gridspec(3, 3, left=0.02, right=0.98, hspace=0.4, wspace=0.3)
     
     # ========================================================================
     # COLUMN 1: SIMULATION INPUTS & CONFIGURATION
@@ -48,70 +186,47 @@ def create_summary_dashboard():
     ax_inputs.axis('off')
     
     if config_loaded:
-        # DBU mapping for warehouse sizes
-        dbu_mapping = {
-            "2XSmall": 4.0, "XSmall": 6.0, "Small": 12.0, "Medium": 24.0,
-            "Large": 40.0, "XLarge": 80.0, "2XLarge": 144.0, 
-            "3XLarge": 272.0, "4XLarge": 528.0
-        }
         warehouse_size = config['warehouse']['size']
-        dbus_per_hour = dbu_mapping.get(warehouse_size, 0.0)
+        dbus_per_hour = SIZE_DBU_MAPPING.get(warehouse_size, 0.0)
         min_clusters = config['warehouse']['min_clusters']
         
         inputs_data = [
-            ['SIMULATION CONFIGURATION', ''],
-            ['', ''],
-            ['Duration', f"{config['simulation']['days']} days"],
-            ['', ''],
-            ['WAREHOUSE SETTINGS', ''],
-            ['', ''],
-            ['Size', warehouse_size],
-            ['DBUs per Hour', f"{dbus_per_hour:.1f} per cluster"],
-            ['Min Clusters', f"{min_clusters} {'(auto-suspend)' if min_clusters == 0 else '(always-on)'}"],
-            ['Max Clusters', f"{config['warehouse']['max_clusters']}"],
-            ['Target Concurrency', f"{config['warehouse']['target_concurrency_per_cluster']} queries/cluster"],
-            ['Idle Shutdown', f"{config['warehouse']['idle_shutdown_seconds']:.0f} seconds"],
-            ['', ''],
-            ['WORKLOAD SETTINGS', ''],
-            ['', ''],
-            ['Dashboards', f"{config['dashboard']['num_dashboards']}"],
-            ['Refreshes per Day', f"{config['dashboard']['refreshes_per_day']}"],
-            ['', ''],
-            ['Peak Concurrent Users', f"{config['genie']['peak_concurrent_users_min']}-{config['genie']['peak_concurrent_users_max']}"],
-            ['Queries per User/Hour', f"{config['genie']['avg_queries_per_user_per_hour']}"],
-            ['Cache Hit Rate', f"{config['genie']['cache_hit_rate']*100:.0f}%"],
-            ['Business Hours', f"{config['genie']['business_hours_start']}-{config['genie']['business_hours_end']}"],
-            ['', ''],
-            ['PRICING', ''],
-            ['', ''],
-            ['SQL Serverless Rate', f"${config['pricing']['sql_serverless_dbu_rate']:.3f} / DBU"],
-            ['GenAI Inference Rate', f"${config['pricing']['serverless_realtime_inference_dbu_rate']:.3f} / DBU"],
+            ('SIMULATION CONFIGURATION', '', 'header'),
+            BLANK_ROW,
+            ('Duration', f"{config['simulation']['days']} days", 'kv'),
+            BLANK_ROW,
+            ('WAREHOUSE SETTINGS', '', 'header'),
+            BLANK_ROW,
+            ('Size', warehouse_size, 'kv'),
+            ('DBUs per Hour', f"{dbus_per_hour:.1f} per cluster", 'kv'),
+            ('Min Clusters', f"{min_clusters} {'(auto-suspend)' if min_clusters == 0 else '(always-on)'}", 'kv'),
+            ('Max Clusters', f"{config['warehouse']['max_clusters']}", 'kv'),
+            ('Target Concurrency', f"{config['warehouse']['target_concurrency_per_cluster']} queries/cluster", 'kv'),
+            ('Idle Shutdown', f"{config['warehouse']['idle_shutdown_seconds']:.0f} seconds", 'kv'),
+            BLANK_ROW,
+            ('WORKLOAD SETTINGS', '', 'header'),
+            BLANK_ROW,
+            ('Dashboards', f"{config['dashboard']['num_dashboards']}", 'kv'),
+            ('Refreshes per Day', f"{config['dashboard']['refreshes_per_day']}", 'kv'),
+            BLANK_ROW,
+            ('Peak Concurrent Users', f"{config['genie']['peak_concurrent_users_min']}-{config['genie']['peak_concurrent_users_max']}", 'kv'),
+            ('Queries per User/Hour', f"{config['genie']['avg_queries_per_user_per_hour']}", 'kv'),
+            ('Cache Hit Rate', f"{config['genie']['cache_hit_rate']*100:.0f}%", 'kv'),
+            ('Business Hours', f"{config['genie']['business_hours_start']}-{config['genie']['business_hours_end']}", 'kv'),
+            BLANK_ROW,
+            ('PRICING', '', 'header'),
+            BLANK_ROW,
+            ('SQL Serverless Rate', f"${config['pricing']['sql_serverless_dbu_rate']:.3f} / DBU", 'kv'),
+            ('GenAI Inference Rate', f"${config['pricing']['serverless_realtime_inference_dbu_rate']:.3f} / DBU", 'kv'),
         ]
     else:
         inputs_data = [
-            ['SIMULATION CONFIGURATION', ''],
-            ['', ''],
-            ['Status', 'Config file not found'],
+            ('SIMULATION CONFIGURATION', '', 'header'),
+            BLANK_ROW,
+            ('Status', 'Config file not found', 'kv'),
         ]
     
-    table_inputs = ax_inputs.table(cellText=inputs_data, cellLoc='left', loc='center',
-                                   colWidths=[0.55, 0.45])
-    table_inputs.auto_set_font_size(False)
-    table_inputs.set_fontsize(11)
-    table_inputs.scale(1, 2.2)
-    
-    # Style header rows
-    header_color = '#2E86AB'
-    for i, row in enumerate(inputs_data):
-        if row[0] in ['SIMULATION CONFIGURATION', 'WAREHOUSE SETTINGS', 'WORKLOAD SETTINGS', 'PRICING']:
-            table_inputs[(i, 0)].set_facecolor(header_color)
-            table_inputs[(i, 0)].set_text_props(weight='bold', color='white', fontsize=12)
-            table_inputs[(i, 1)].set_facecolor(header_color)
-        elif row[0] == '':
-            table_inputs[(i, 0)].set_facecolor('#F0F0F0')
-            table_inputs[(i, 1)].set_facecolor('#F0F0F0')
-        else:
-            table_inputs[(i, 0)].set_text_props(weight='bold')
+    _draw_table(ax_inputs, inputs_data, INPUTS_PALETTE)
     
     ax_inputs.set_title('Configuration & Inputs', fontsize=16, fontweight='bold', pad=30)
     
@@ -128,62 +243,41 @@ def create_summary_dashboard():
         hourly_cost = metrics['total_cost'] / sim_hours
         
         costs_data = [
-            ['COST SUMMARY', ''],
-            ['', ''],
-            ['Total DBUs Consumed', f"{metrics['total_dbus']:,.1f}"],
-            ['Total Cost', f"${metrics['total_cost']:,.2f}"],
-            ['', ''],
-            ['RATES', ''],
-            ['', ''],
-            ['DBUs per Hour', f"{dbus_per_hour:.2f}"],
-            ['Cost per Hour', f"${hourly_cost:.2f}"],
-            ['Cost per Day', f"${metrics['daily_cost']:,.2f}"],
-            ['', ''],
-            ['PROJECTIONS', ''],
-            ['', ''],
-            ['Weekly Cost (7 days)', f"${metrics['daily_cost'] * 7:,.2f}"],
-            ['Monthly Cost (30 days)', f"${metrics['monthly_cost']:,.2f}"],
-            ['Quarterly (90 days)', f"${metrics['monthly_cost'] * 3:,.2f}"],
-            ['Annual Cost (365 days)', f"${metrics['annual_cost']:,.2f}"],
-            ['', ''],
-            ['EFFICIENCY METRICS', ''],
-            ['', ''],
-            ['Total Queries', f"{metrics['total_queries']:,}"],
-            ['DBUs per Query', f"{metrics['total_dbus'] / metrics['total_queries']:.4f}"],
-            ['Cost per Query', f"${metrics['total_cost'] / metrics['total_queries']:.4f}"],
-            ['', ''],
-            ['Queries per Day', f"{metrics['total_queries'] / metrics['simulation_days']:,.0f}"],
-            ['Queries per Hour', f"{metrics['total_queries'] / sim_hours:,.0f}"],
+            ('COST SUMMARY', '', 'header'),
+            BLANK_ROW,
+            ('Total DBUs Consumed', f"{metrics['total_dbus']:,.1f}", 'kv'),
+            ('Total Cost', f"${metrics['total_cost']:,.2f}", 'kv'),
+            BLANK_ROW,
+            ('RATES', '', 'header'),
+            BLANK_ROW,
+            ('DBUs per Hour', f"{dbus_per_hour:.2f}", 'kv'),
+            ('Cost per Hour', f"${hourly_cost:.2f}", 'kv'),
+            ('Cost per Day', f"${metrics['daily_cost']:,.2f}", 'kv'),
+            BLANK_ROW,
+            ('PROJECTIONS', '', 'header'),
+            BLANK_ROW,
+            ('Weekly Cost (7 days)', f"${metrics['daily_cost'] * 7:,.2f}", 'kv'),
+            ('Monthly Cost (30 days)', f"${metrics['monthly_cost']:,.2f}", 'highlight'),
+            ('Quarterly (90 days)', f"${metrics['monthly_cost'] * 3:,.2f}", 'kv'),
+            ('Annual Cost (365 days)', f"${metrics['annual_cost']:,.2f}", 'highlight'),
+            BLANK_ROW,
+            ('EFFICIENCY METRICS', '', 'header'),
+            BLANK_ROW,
+            ('Total Queries', f"{metrics['total_queries']:,}", 'kv'),
+            ('DBUs per Query', f"{metrics['total_dbus'] / metrics['total_queries']:.4f}", 'kv'),
+            ('Cost per Query', f"${metrics['total_cost'] / metrics['total_queries']:.4f}", 'kv'),
+            BLANK_ROW,
+            ('Queries per Day', f"{metrics['total_queries'] / metrics['simulation_days']:,.0f}", 'kv'),
+            ('Queries per Hour', f"{metrics['total_queries'] / sim_hours:,.0f}", 'kv'),
         ]
     else:
         costs_data = [
-            ['COST SUMMARY', ''],
-            ['', ''],
-            ['Status', 'Run simulation first'],
+            ('COST SUMMARY', '', 'header'),
+            BLANK_ROW,
+            ('Status', 'Run simulation first', 'kv'),
         ]
     
-    table_costs = ax_costs.table(cellText=costs_data, cellLoc='left', loc='center',
-                                 colWidths=[0.55, 0.45])
-    table_costs.auto_set_font_size(False)
-    table_costs.set_fontsize(11)
-    table_costs.scale(1, 2.2)
-    
-    # Style header rows
-    for i, row in enumerate(costs_data):
-        if row[0] in ['COST SUMMARY', 'RATES', 'PROJECTIONS', 'EFFICIENCY METRICS']:
-            table_costs[(i, 0)].set_facecolor('#A23B72')
-            table_costs[(i, 0)].set_text_props(weight='bold', color='white', fontsize=12)
-            table_costs[(i, 1)].set_facecolor('#A23B72')
-        elif row[0] == '':
-            table_costs[(i, 0)].set_facecolor('#F0F0F0')
-            table_costs[(i, 1)].set_facecolor('#F0F0F0')
-        else:
-            table_costs[(i, 0)].set_text_props(weight='bold')
-            # Highlight key projections
-            if row[0] in ['Monthly Cost (30 days)', 'Annual Cost (365 days)']:
-                table_costs[(i, 0)].set_facecolor('#FFF3CD')
-                table_costs[(i, 1)].set_facecolor('#FFF3CD')
-                table_costs[(i, 1)].set_text_props(weight='bold', color='#856404')
+    _draw_table(ax_costs, costs_data, COSTS_PALETTE)
     
     ax_costs.set_title('Cost Analysis & Projections', fontsize=16, fontweight='bold', pad=30)
     
@@ -195,19 +289,13 @@ def create_summary_dashboard():
     
     if metrics_loaded:
         # Calculate cluster statistics
-        zero_mask = df['Clusters'] == 0
-        zero_pct = (zero_mask.sum() / len(df)) * 100
+        # Count on the raw arrays rather than through pandas Series
+        zero_mask = df['Clusters'].to_numpy() == 0
+        zero_pct = (np.count_nonzero(zero_mask) / zero_mask.size) * 100
+        queued_steps = np.count_nonzero(df['Queued Queries'].to_numpy() > 0)
         
-        # Find zero periods
-        zero_periods = []
-        in_zero = False
-        for i, row in df.iterrows():
-            if row['Clusters'] == 0 and not in_zero:
-                in_zero = True
-            elif row['Clusters'] > 0 and in_zero:
-                zero_periods.append(1)
-                in_zero = False
-        num_zero_periods = len(zero_periods)
+        # Count zero periods that ended with a scale-up (zero -> non-zero steps)
+        num_zero_periods = int(np.count_nonzero(np.diff(zero_mask.view(np.int8)) == -1))
         
         # Performance assessment
         p95_wait = metrics['genie_p95_wait_time']
@@ -223,77 +311,44 @@ def create_summary_dashboard():
         else:
             p95_status = '⚠ Poor - Scale Up'
             p95_color = '#DC3545'
+        perf_palette = {**PERF_PALETTE, 'status': p95_color}
         
         perf_data = [
-            ['GENIE WAIT TIMES', ''],
-            ['', ''],
-            ['Average Wait', f"{metrics['genie_avg_wait_time']:.2f} seconds"],
-            ['P50 (Median)', f"{metrics['genie_p50_wait_time']:.2f} seconds"],
-            ['P95 (95th percentile)', f"{metrics['genie_p95_wait_time']:.2f} seconds"],
-            ['P99 (99th percentile)', f"{metrics['genie_p99_wait_time']:.2f} seconds"],
-            ['', ''],
-            ['P95 Assessment', p95_status],
-            ['', ''],
-            ['WAREHOUSE BEHAVIOR', ''],
-            ['', ''],
-            ['Average Active Clusters', f"{metrics['avg_clusters']:.2f}"],
-            ['Peak Clusters', f"{metrics['max_clusters']}"],
-            ['Average Utilization', f"{metrics['avg_utilization']*100:.1f}%"],
-            ['', ''],
-            ['SCALE-TO-ZERO ANALYSIS', ''],
-            ['', ''],
-            ['Time at Zero', f"{zero_pct:.1f}%"],
-            ['Zero-Scale Events', f"{num_zero_periods}"],
-            ['Cost Savings', f"~{(1 - metrics['avg_clusters'])*100:.0f}% vs always-on"],
-            ['', ''],
-            ['QUEUE STATISTICS', ''],
-            ['', ''],
-            ['Max Queue Depth', f"{metrics['max_queue_depth']}"],
-            ['Queries Queued', f"{(df['Queued Queries'] > 0).sum()} events"],
+            ('GENIE WAIT TIMES', '', 'header'),
+            BLANK_ROW,
+            ('Average Wait', f"{metrics['genie_avg_wait_time']:.2f} seconds", 'kv'),
+            ('P50 (Median)', f"{metrics['genie_p50_wait_time']:.2f} seconds", 'kv'),
+            ('P95 (95th percentile)', f"{metrics['genie_p95_wait_time']:.2f} seconds", 'highlight'),
+            ('P99 (99th percentile)', f"{metrics['genie_p99_wait_time']:.2f} seconds", 'kv'),
+            BLANK_ROW,
+            ('P95 Assessment', p95_status, 'status'),
+            BLANK_ROW,
+            ('WAREHOUSE BEHAVIOR', '', 'header'),
+            BLANK_ROW,
+            ('Average Active Clusters', f"{metrics['avg_clusters']:.2f}", 'kv'),
+            ('Peak Clusters', f"{metrics['max_clusters']}", 'kv'),
+            ('Average Utilization', f"{metrics['avg_utilization']*100:.1f}%", 'kv'),
+            BLANK_ROW,
+            ('SCALE-TO-ZERO ANALYSIS', '', 'header'),
+            BLANK_ROW,
+            ('Time at Zero', f"{zero_pct:.1f}%", 'kv'),
+            ('Zero-Scale Events', f"{num_zero_periods}", 'kv'),
+            ('Cost Savings', f"~{(1 - metrics['avg_clusters'])*100:.0f}% vs always-on", 'kv'),
+            BLANK_ROW,
+            ('QUEUE STATISTICS', '', 'header'),
+            BLANK_ROW,
+            ('Max Queue Depth', f"{metrics['max_queue_depth']}", 'kv'),
+            ('Queries Queued', f"{queued_steps} events", 'kv'),
         ]
-        
-        # Add row for P95 color
-        p95_row_idx = None
-        for i, row in enumerate(perf_data):
-            if row[0] == 'P95 Assessment':
-                p95_row_idx = i
-                break
     else:
         perf_data = [
-            ['PERFORMANCE METRICS', ''],
-            ['', ''],
-            ['Status', 'Run simulation first'],
+            ('PERFORMANCE METRICS', '', 'header'),
+            BLANK_ROW,
+            ('Status', 'Run simulation first', 'kv'),
         ]
-        p95_row_idx = None
-    
-    table_perf = ax_perf.table(cellText=perf_data, cellLoc='left', loc='center',
-                               colWidths=[0.55, 0.45])
-    table_perf.auto_set_font_size(False)
-    table_perf.set_fontsize(11)
-    table_perf.scale(1, 2.2)
+        perf_palette = PERF_PALETTE
     
-    # Style header rows
-    for i, row in enumerate(perf_data):
-        if row[0] in ['GENIE WAIT TIMES', 'WAREHOUSE BEHAVIOR', 
-                      'SCALE-TO-ZERO ANALYSIS', 'QUEUE STATISTICS']:
-            table_perf[(i, 0)].set_facecolor('#06A77D')
-            table_perf[(i, 0)].set_text_props(weight='bold', color='white', fontsize=12)
-            table_perf[(i, 1)].set_facecolor('#06A77D')
-        elif row[0] == '':
-            table_perf[(i, 0)].set_facecolor('#F0F0F0')
-            table_perf[(i, 1)].set_facecolor('#F0F0F0')
-        else:
-            table_perf[(i, 0)].set_text_props(weight='bold')
-            # Highlight P95
-            if row[0] in ['P95 (95th percentile)']:
-                table_perf[(i, 0)].set_facecolor('#FFF9E6')
-                table_perf[(i, 1)].set_facecolor('#FFF9E6')
-                table_perf[(i, 1)].set_text_props(weight='bold')
-        
-        # Color the P95 assessment
-        if i == p95_row_idx and metrics_loaded:
-            table_perf[(i, 1)].set_text_props(weight='bold', color='white')
-            table_perf[(i, 1)].set_facecolor(p95_color)
+    _draw_table(ax_perf, perf_data, perf_palette)
     
     ax_perf.set_title('Performance & Wait Time Analysis', fontsize=16, fontweight='bold', pad=30)
     
@@ -303,18 +358,20 @@ def create_summary_dashboard():
     fig.suptitle('Databricks Serverless SQL Warehouse - Simulation Summary', 
                  fontsize=20, fontweight='bold', y=0.98)
     
-    from datetime import datetime
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     fig.text(0.5, 0.01, f'Generated: {timestamp}', 
              ha='center', fontsize=10, style='italic', color='gray')
     
-    # Save
-    plt.savefig('results/dashboard_summary.png', dpi=200, bbox_inches='tight')
-    print('✅ Created summary dashboard: results/dashboard_summary.png')
-    
-    return fig
+    # Save without bbox_inches='tight', which would draw the figure twice.
+    # Encode in memory and swap the file in whole, so a viewer watching the
+    # results never reads a half-written PNG
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=200,
+                pil_kwargs={'optimize': False, 'compress_level': 1})
+    tmp_file = output_path / 'dashboard_summary.png.tmp'
+    tmp_file.write_bytes(buf.getvalue())
+    tmp_file.replace(output_path / 'dashboard_summary.png')
 
 if __name__ == '__main__':
     create_summary_dashboard()
-    plt.close()
 
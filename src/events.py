@@ -3,12 +3,13 @@ Event generation for dashboard refreshes and Genie queries.
 """
 
 import numpy as np
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from .config import SimulationConfig
+from .config import SimulationConfig, SIZE_DBU_MAPPING
 
 
-@dataclass
+@dataclass(slots=True)
 class Query:
     """Represents a single query (dashboard or Genie)."""
     
@@ -24,14 +25,55 @@ class Query:
         return self.start_time + self.duration
 
 
+# Redraw rounds for truncated normal sampling before clipping the remainder
+MAX_TRUNCATION_REDRAWS = 20
+
+
+@lru_cache(maxsize=None)
+def _size_performance_multiplier(dbus_per_hour: float) -> float:
+    """Query duration multiplier for a warehouse size, relative to Medium (24 DBUs)."""
+    baseline_dbus = 24.0  # Medium warehouse baseline
+    
+    # Use square root scaling for realistic performance gains
+    # This means doubling DBUs gives ~1.4x performance improvement
+    # Following typical compute scaling laws (sub-linear)
+    return (baseline_dbus / dbus_per_hour) ** 0.5
+
+
+def _describe_performance(multiplier: float) -> str:
+    """Describe a duration multiplier as query speed relative to Medium."""
+    if multiplier < 1.0:
+        return f"{1/multiplier:.2f}x faster"
+    elif multiplier > 1.0:
+        return f"{multiplier:.2f}x slower"
+    return "baseline"
+
+
+# Query speed of each warehouse size relative to Medium, e.g. "2.00x slower"
+SIZE_PERFORMANCE_DESCRIPTIONS: Dict[str, str] = {
+    size: _describe_performance(_size_performance_multiplier(dbus_per_hour))
+    for size, dbus_per_hour in SIZE_DBU_MAPPING.items()
+}
+
+
 class EventGenerator:
     """Generates query events for the simulation."""
     
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, performance_multiplier: Optional[float] = None):
+        """
+        Args:
+            config: Simulation configuration
+            performance_multiplier: Override the size-derived query duration
+                multiplier (1.0 generates durations unscaled by warehouse size)
+        """
         self.config = config
         self.query_counter = 0
+        # Dedicated PCG64 stream, so generation never touches the global RNG
+        self.rng = config.make_rng()
         # Calculate performance multiplier based on warehouse size
-        self._performance_multiplier = self._calculate_performance_multiplier()
+        if performance_multiplier is None:
+            performance_multiplier = self._calculate_performance_multiplier()
+        self._performance_multiplier = performance_multiplier
     
     def _calculate_performance_multiplier(self) -> float:
         """
@@ -42,13 +84,7 @@ class EventGenerator:
             Performance multiplier (< 1.0 = faster, > 1.0 = slower)
             Baseline is Medium (24 DBUs) = 1.0x
         """
-        dbus_per_hour = self.config.warehouse.dbus_per_hour
-        baseline_dbus = 24.0  # Medium warehouse baseline
-        
-        # Use square root scaling for realistic performance gains
-        # This means doubling DBUs gives ~1.4x performance improvement
-        # Following typical compute scaling laws (sub-linear)
-        multiplier = (baseline_dbus / dbus_per_hour) ** 0.5
+        multiplier = _size_performance_multiplier(self.config.warehouse.dbus_per_hour)
         
         # Examples:
         # 2XSmall (4 DBU): (24/4)^0.5 = 2.45x slower
@@ -61,6 +97,25 @@ class EventGenerator:
         
         return multiplier
     
+    def _truncated_normal(self, loc: float, scale: float, low: float, high: float, size: int) -> np.ndarray:
+        """
+        Draw from a normal distribution truncated to [low, high].
+        
+        Out-of-range samples are redrawn rather than clipped, so they do not
+        pile up on the bounds. Anything still out of range after
+        MAX_TRUNCATION_REDRAWS rounds (only when the bounds sit far in the
+        tails) is clipped.
+        """
+        samples = self.rng.normal(loc, scale, size=size)
+        for _ in range(MAX_TRUNCATION_REDRAWS):
+            outside = (samples < low) | (samples > high)
+            num_outside = np.count_nonzero(outside)
+            if num_outside == 0:
+                break
+            samples[outside] = self.rng.normal(loc, scale, size=num_outside)
+        
+        return np.clip(samples, low, high, out=samples)
+    
     def generate_dashboard_queries(self) -> List[Query]:
         """
         Generate all dashboard refresh queries for the simulation period.
@@ -68,55 +123,48 @@ class EventGenerator:
         Returns:
             List of Query objects representing dashboard refreshes
         """
-        queries = []
+        dashboard = self.config.dashboard
         total_seconds = self.config.total_seconds
-        seconds_per_refresh = (24 * 3600) / self.config.dashboard.refreshes_per_day
-        
-        for dashboard_id in range(self.config.dashboard.num_dashboards):
-            # Calculate refresh times for this dashboard
-            # Add some jitter based on overlap factor
-            base_offset = dashboard_id * (seconds_per_refresh / self.config.dashboard.num_dashboards)
-            jitter_scale = seconds_per_refresh * self.config.dashboard.refresh_overlap_factor
-            
-            for refresh_num in range(self.config.dashboard.refreshes_per_day * self.config.simulation_days):
-                # Base refresh time
-                refresh_time = refresh_num * seconds_per_refresh + base_offset
-                
-                # Add jitter to create overlap
-                if self.config.dashboard.refresh_overlap_factor > 0:
-                    jitter = np.random.normal(0, jitter_scale)
-                    refresh_time += jitter
-                
-                # Skip if outside simulation window
-                if refresh_time < 0 or refresh_time >= total_seconds:
-                    continue
-                
-                # Generate runtime with variability
-                runtime = np.random.normal(
-                    self.config.dashboard.avg_refresh_runtime,
-                    self.config.dashboard.refresh_runtime_std
-                )
-                runtime = np.clip(
-                    runtime,
-                    self.config.dashboard.min_refresh_runtime,
-                    self.config.dashboard.max_refresh_runtime
-                )
-                
-                # Apply warehouse performance scaling
-                # Larger warehouses execute queries faster
-                runtime = runtime * self._performance_multiplier
-                
-                query = Query(
-                    query_id=self.query_counter,
-                    query_type="dashboard",
-                    start_time=refresh_time,
-                    duration=runtime,
-                    uses_genai=False
-                )
-                queries.append(query)
-                self.query_counter += 1
-        
-        return sorted(queries, key=lambda q: q.start_time)
+        seconds_per_refresh = (24 * 3600) / dashboard.refreshes_per_day
+        num_refreshes = dashboard.refreshes_per_day * self.config.simulation_days
+        
+        # Refresh schedule as a (dashboard, refresh) grid; each dashboard is
+        # offset so the refreshes spread across the refresh interval
+        base_offsets = np.arange(dashboard.num_dashboards) * (seconds_per_refresh / dashboard.num_dashboards)
+        refresh_times = np.arange(num_refreshes) * seconds_per_refresh + base_offsets[:, None]
+        
+        # Add jitter to create overlap
+        if dashboard.refresh_overlap_factor > 0:
+            jitter_scale = seconds_per_refresh * dashboard.refresh_overlap_factor
+            refresh_times += self.rng.normal(0, jitter_scale, size=refresh_times.shape)
+        
+        # Skip refreshes outside the simulation window; flattening row by row
+        # keeps query ids numbered dashboard by dashboard
+        refresh_times = refresh_times.ravel()
+        refresh_times = refresh_times[(refresh_times >= 0) & (refresh_times < total_seconds)]
+        
+        # Generate runtimes with variability, scaled by warehouse performance
+        # (larger warehouses execute queries faster)
+        m = self._performance_multiplier
+        runtimes = self._truncated_normal(
+            dashboard.avg_refresh_runtime * m,
+            dashboard.refresh_runtime_std * m,
+            dashboard.min_refresh_runtime * m,
+            dashboard.max_refresh_runtime * m,
+            size=refresh_times.size
+        )
+        
+        first_id = self.query_counter
+        self.query_counter += refresh_times.size
+        
+        # Build Query objects only once, in start time order
+        order = np.argsort(refresh_times, kind='stable')
+        return [
+            Query(first_id + i, "dashboard", start_time, runtime, False)
+            for i, start_time, runtime in zip(
+                order.tolist(), refresh_times[order].tolist(), runtimes[order].tolist()
+            )
+        ]
     
     def generate_genie_queries(self) -> List[Query]:
         """
@@ -125,87 +173,72 @@ class EventGenerator:
         Returns:
             List of Query objects representing Genie queries
         """
-        queries = []
+        genie = self.config.genie
         total_seconds = self.config.total_seconds
         
-        # Simulate user activity throughout the day
-        current_time = 0.0
+        # Simulate user activity throughout the day, one minute at a time
+        time_window = 60.0
+        window_starts = np.arange(0.0, total_seconds, time_window)
+        
+        # The activity profile repeats daily, so build the arrival rates for
+        # one day of windows and tile them across the horizon
+        day_starts = window_starts[:int(24 * 3600 / time_window)]
+        
+        # Determine if we're in business hours
+        hour_of_day = (day_starts / 3600) % 24
+        is_business_hours = (genie.business_hours_start <= hour_of_day) & (hour_of_day < genie.business_hours_end)
         
-        while current_time < total_seconds:
-            # Determine if we're in business hours
-            hour_of_day = (current_time / 3600) % 24
-            is_business_hours = (
-                self.config.genie.business_hours_start <= hour_of_day < self.config.genie.business_hours_end
+        # Bell curve for user activity, peaking in the middle of the business day
+        hours_into_business_day = hour_of_day - genie.business_hours_start
+        business_day_length = genie.business_hours_end - genie.business_hours_start
+        peak_position = business_day_length / 2
+        activity_factor = np.exp(-((hours_into_business_day - peak_position) ** 2) / (2 * (business_day_length / 4) ** 2))
+        
+        # Concurrent users vary during business hours; off hours have minimal activity
+        business_users = np.floor(
+            genie.peak_concurrent_users_min +
+            activity_factor * (genie.peak_concurrent_users_max - genie.peak_concurrent_users_min)
+        )
+        off_hours_users = max(1, int(genie.peak_concurrent_users_min * 0.2))
+        concurrent_users = np.where(is_business_hours, business_users, off_hours_users)
+        
+        # Each user generates queries according to avg_queries_per_user_per_hour;
+        # use a Poisson process for the arrivals in each window
+        queries_per_second = (concurrent_users * genie.avg_queries_per_user_per_hour) / 3600
+        queries_per_second = np.resize(queries_per_second, window_starts.size)
+        num_queries = self.rng.poisson(queries_per_second * time_window)
+        
+        # Spread each window's arrivals uniformly within the window
+        total_queries = int(num_queries.sum())
+        start_times = np.repeat(window_starts, num_queries) + self.rng.uniform(0, time_window, size=total_queries)
+        start_times = start_times[start_times < total_seconds]
+        count = start_times.size
+        
+        # Determine query duration (cache hit vs miss) with one normal draw,
+        # scaled by warehouse performance (larger warehouses execute queries faster)
+        m = self._performance_multiplier
+        is_cache_hit = self.rng.random(count) < genie.cache_hit_rate
+        durations = self.rng.normal(
+            np.where(is_cache_hit, genie.cache_hit_avg_time * m, genie.cache_miss_avg_time * m),
+            np.where(is_cache_hit, genie.cache_hit_std * m, genie.cache_miss_std * m)
+        )
+        durations = np.maximum(durations, 0.1 * m)
+        
+        # Determine if query uses GenAI
+        uses_genai = self.rng.random(count) < genie.fraction_using_genai
+        
+        first_id = self.query_counter
+        self.query_counter += count
+        
+        # Build Query objects only once, in start time order
+        order = np.argsort(start_times, kind='stable')
+        return [
+            Query(first_id + i, "genie", start_time, duration, genai)
+            for i, start_time, duration, genai in zip(
+                order.tolist(), start_times[order].tolist(),
+                durations[order].tolist(), uses_genai[order].tolist()
             )
-            
-            if is_business_hours:
-                # Determine concurrent users (varies during business hours)
-                # Peak in middle of day
-                hours_into_business_day = hour_of_day - self.config.genie.business_hours_start
-                business_day_length = self.config.genie.business_hours_end - self.config.genie.business_hours_start
-                
-                # Bell curve for user activity
-                peak_position = business_day_length / 2
-                activity_factor = np.exp(-((hours_into_business_day - peak_position) ** 2) / (2 * (business_day_length / 4) ** 2))
-                
-                concurrent_users = int(
-                    self.config.genie.peak_concurrent_users_min +
-                    activity_factor * (self.config.genie.peak_concurrent_users_max - self.config.genie.peak_concurrent_users_min)
-                )
-            else:
-                # Off hours: minimal activity
-                concurrent_users = max(1, int(self.config.genie.peak_concurrent_users_min * 0.2))
-            
-            # Generate queries for active users in this time window
-            # Each user generates queries according to avg_queries_per_user_per_hour
-            queries_per_second = (concurrent_users * self.config.genie.avg_queries_per_user_per_hour) / 3600
-            
-            # Use Poisson process to generate query arrivals in next time window
-            time_window = 60.0  # Generate queries for next minute
-            expected_queries = queries_per_second * time_window
-            num_queries = np.random.poisson(expected_queries)
-            
-            # Generate individual query times within this window
-            for _ in range(num_queries):
-                query_time = current_time + np.random.uniform(0, time_window)
-                
-                if query_time >= total_seconds:
-                    break
-                
-                # Determine query duration (cache hit vs miss)
-                is_cache_hit = np.random.random() < self.config.genie.cache_hit_rate
-                
-                if is_cache_hit:
-                    duration = max(0.1, np.random.normal(
-                        self.config.genie.cache_hit_avg_time,
-                        self.config.genie.cache_hit_std
-                    ))
-                else:
-                    duration = max(0.1, np.random.normal(
-                        self.config.genie.cache_miss_avg_time,
-                        self.config.genie.cache_miss_std
-                    ))
-                
-                # Apply warehouse performance scaling
-                # Larger warehouses execute queries faster
-                duration = duration * self._performance_multiplier
-                
-                # Determine if query uses GenAI
-                uses_genai = np.random.random() < self.config.genie.fraction_using_genai
-                
-                query = Query(
-                    query_id=self.query_counter,
-                    query_type="genie",
-                    start_time=query_time,
-                    duration=duration,
-                    uses_genai=uses_genai
-                )
-                queries.append(query)
-                self.query_counter += 1
-            
-            current_time += time_window
-        
-        return sorted(queries, key=lambda q: q.start_time)
+        ]
     
     def generate_all_queries(self) -> Tuple[List[Query], List[Query]]:
         """
@@ -231,5 +264,9 @@ class EventGenerator:
             Combined and sorted list of all queries
         """
         all_queries = dashboard_queries + genie_queries
-        return sorted(all_queries, key=lambda q: q.start_time)
+        start_times = np.fromiter((q.start_time for q in all_queries), dtype=np.float64, count=len(all_queries))
+        
+        # Stable, so ties keep dashboard queries ahead of Genie queries
+        order = np.argsort(start_times, kind='stable')
+        return [all_queries[i] for i in order.tolist()]
 
@@ -3,14 +3,22 @@ Main simulation engine for Databricks Serverless SQL Warehouse cost modeling.
 """
 
 import numpy as np
-from typing import List, Dict, Tuple
-from dataclasses import dataclass, field
+from typing import Deque, List, Dict, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace, asdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import hashlib
+import heapq
 import logging
-from collections import defaultdict
+import math
+import os
+import pickle
+import tempfile
+from collections import defaultdict, deque
 
-from .config import SimulationConfig
-from .events import EventGenerator, Query
-from .warehouse import ServerlessWarehouse, WarehouseState
+from .config import SimulationConfig, bypass_validators
+from .events import EventGenerator, Query, _size_performance_multiplier
+from .warehouse import ClusterState, ServerlessWarehouse, StateHistory
 
 
 @dataclass
@@ -35,6 +43,44 @@ class QueryExecution:
         return self.completed_time - self.query.start_time
 
 
+# Query type codes stored in ExecutionArrays.query_type
+QUERY_TYPE_CODES = {"dashboard": 0, "genie": 1}
+
+
+# Seconds between warehouse state records
+STATE_RECORD_INTERVAL = 60.0
+
+
+@dataclass
+class ExecutionArrays:
+    """
+    Execution tracking for every query of a run as parallel arrays.
+    
+    Row i describes the i-th query in arrival order. Times of queries that
+    were never assigned or never completed are NaN.
+    """
+    
+    start_time: np.ndarray  # float64, submission time
+    query_type: np.ndarray  # int8, see QUERY_TYPE_CODES
+    uses_genai: np.ndarray  # bool
+    assigned_time: np.ndarray  # float64, when assigned to a cluster
+    completed_time: np.ndarray  # float64, when completed
+    cluster_id: np.ndarray  # int32, executing cluster (-1 if unassigned)
+    
+    @classmethod
+    def from_queries(cls, queries: List[Query]) -> "ExecutionArrays":
+        """Allocate tracking arrays for queries (sorted by start time)."""
+        n = len(queries)
+        return cls(
+            start_time=np.fromiter((q.start_time for q in queries), dtype=np.float64, count=n),
+            query_type=np.fromiter((QUERY_TYPE_CODES[q.query_type] for q in queries), dtype=np.int8, count=n),
+            uses_genai=np.fromiter((q.uses_genai for q in queries), dtype=bool, count=n),
+            assigned_time=np.full(n, np.nan),
+            completed_time=np.full(n, np.nan),
+            cluster_id=np.full(n, -1, dtype=np.int32),
+        )
+
+
 @dataclass
 class SimulationMetrics:
     """Aggregated metrics from simulation run."""
@@ -76,7 +122,7 @@ class SimulationMetrics:
     max_queue_depth: int = 0
     
     # Time series data
-    state_history: List[WarehouseState] = field(default_factory=list)
+    state_history: StateHistory = field(default_factory=StateHistory)
     wait_times: List[float] = field(default_factory=list)
     genie_wait_times: List[float] = field(default_factory=list)
     dashboard_wait_times: List[float] = field(default_factory=list)
@@ -89,165 +135,212 @@ class Simulator:
     
     def __init__(self, config: SimulationConfig):
         self.config = config
-        self.warehouse = ServerlessWarehouse(config)
+        # Warehouse snapshots, one slot per state record (at most one a minute)
+        n_slots = math.ceil((config.total_seconds + 3600) / STATE_RECORD_INTERVAL) + 1
+        self.warehouse = ServerlessWarehouse(config, history_capacity=n_slots)
         self.event_generator = EventGenerator(config)
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
-        # Tracking structures
-        self.query_executions: List[QueryExecution] = []
-        self.active_queries: Dict[int, Tuple[Query, object, float]] = {}  # query_id -> (query, cluster, start)
-        self.query_queue: List[Query] = []
+        # Tracking structures; queries are referred to by their index in
+        # arrival order, which is also their row in self.executions
+        self.queries: List[Query] = []
+        self.executions: Optional[ExecutionArrays] = None
+        # Running queries: heap of (end_time, query index, cluster)
+        self.active_queries: List[Tuple[float, int, ClusterState]] = []
+        self.query_queue: Deque[int] = deque()  # query indices
         
         # Metrics
         self.total_dbus = 0.0
         self.genai_dbus = 0.0
     
-    def run(self) -> SimulationMetrics:
+    def run(self, workload: Optional[Tuple[List[Query], List[Query]]] = None) -> SimulationMetrics:
         """
         Run the simulation.
         
+        Args:
+            workload: Pre-generated (dashboard_queries, genie_queries) to replay
+                instead of generating queries from the config
+        
         Returns:
             SimulationMetrics with all results
         """
-        self.logger.info(f"Starting simulation for {self.config.simulation_days} days")
-        self.logger.info(f"Warehouse size: {self.config.warehouse.size} "
-                        f"({self.config.warehouse.dbus_per_hour} DBUs/hour/cluster)")
+        self.logger.info("Starting simulation for %s days", self.config.simulation_days)
+        self.logger.info("Warehouse size: %s (%s DBUs/hour/cluster)",
+                         self.config.warehouse.size, self.config.warehouse.dbus_per_hour)
         
         # Show performance multiplier
         performance_multiplier = self.event_generator._performance_multiplier
         if performance_multiplier < 1.0:
-            self.logger.info(f"Performance: {(1/performance_multiplier):.2f}x faster than Medium warehouse")
+            self.logger.info("Performance: %.2fx faster than Medium warehouse", 1 / performance_multiplier)
         elif performance_multiplier > 1.0:
-            self.logger.info(f"Performance: {performance_multiplier:.2f}x slower than Medium warehouse")
+            self.logger.info("Performance: %.2fx slower than Medium warehouse", performance_multiplier)
         else:
-            self.logger.info(f"Performance: Baseline (Medium warehouse)")
+            self.logger.info("Performance: Baseline (Medium warehouse)")
         
         # Generate all queries
-        self.logger.info("Generating queries...")
-        dashboard_queries, genie_queries = self.event_generator.generate_all_queries()
+        if workload is None:
+            self.logger.info("Generating queries...")
+            dashboard_queries, genie_queries = self.event_generator.generate_all_queries()
+        else:
+            dashboard_queries, genie_queries = workload
         all_queries = self.event_generator.merge_queries(dashboard_queries, genie_queries)
+        self.queries = all_queries
+        self.executions = ExecutionArrays.from_queries(all_queries)
         
-        self.logger.info(f"Generated {len(dashboard_queries)} dashboard queries")
-        self.logger.info(f"Generated {len(genie_queries)} Genie queries")
-        self.logger.info(f"Total queries: {len(all_queries)}")
+        self.logger.info("Generated %d dashboard queries", len(dashboard_queries))
+        self.logger.info("Generated %d Genie queries", len(genie_queries))
+        self.logger.info("Total queries: %d", len(all_queries))
         
-        # Run discrete event simulation
+        # Run discrete event simulation. Time advances in steps of
+        # time_step_seconds, but steps where nothing can happen (no arrival,
+        # completion, state record, warehouse timer or queued query) are
+        # skipped; they are billed in one go since the cluster count cannot
+        # change across them
         self.logger.info("Running simulation...")
+        time_step = self.config.time_step_seconds
         query_index = 0
+        tick = 0
         current_time = 0.0
-        last_state_record = 0.0
-        state_record_interval = 60.0  # Record state every minute
+        next_log_time = 86400.0
+        
+        # Warehouse state is recorded on a schedule of steps, each one
+        # STATE_RECORD_INTERVAL after the previous record
+        next_record_tick = self._first_tick(STATE_RECORD_INTERVAL)
+        
+        # DBUs are billed per cluster per time step; whole cluster-steps are
+        # counted and converted once, instead of summing per-step DBUs
+        cluster_steps = 0
+        dbus_per_cluster_step = self.config.warehouse.dbus_per_hour * (time_step / 3600.0)
+        
+        # Running queries, popped in order of completion
+        completions = self.active_queries
+        completed_time = self.executions.completed_time
+        
+        # Arrivals are sorted, so each step's arrivals are found by bisection
+        arrival_times = self.executions.start_time
+        num_queries = len(all_queries)
+        next_arrival = float(arrival_times[0]) if num_queries else math.inf
         
-        # Progress tracking
+        # Progress tracking (skipped entirely when INFO logging is disabled)
         queries_processed = 0
         last_progress_count = 0
+        progress_logging = (
+            self.config.enable_progress_logging
+            and self.config.progress_log_interval > 0
+            and self.logger.isEnabledFor(logging.INFO)
+        )
         
         # Continue until all queries processed and no active queries
         max_time = self.config.total_seconds + 3600  # Add 1 hour buffer for completion
+        max_tick = self._first_tick(max_time)
         
-        while (query_index < len(all_queries) or self.active_queries or self.query_queue) and current_time < max_time:
+        while (query_index < num_queries or self.active_queries or self.query_queue) and current_time < max_time:
             # Process new query arrivals at current time
-            while query_index < len(all_queries):
-                query = all_queries[query_index]
-                if query.start_time > current_time:
-                    break
-                
-                # Try to assign query to warehouse
-                success, cluster = self.warehouse.assign_query(current_time)
-                
-                if success:
-                    # Query assigned immediately
-                    self.active_queries[query.query_id] = (query, cluster, current_time)
-                    self.query_executions.append(QueryExecution(
-                        query=query,
-                        assigned_time=current_time,
-                        cluster_id=cluster.cluster_id if cluster else None
-                    ))
-                else:
-                    # Query must wait in queue
-                    self.query_queue.append(query)
+            if next_arrival <= current_time:
+                arrived = int(np.searchsorted(arrival_times, current_time, side='right'))
+                for index in range(query_index, arrived):
+                    # Try to assign query to warehouse
+                    success, cluster = self.warehouse.assign_query(current_time)
+                    
+                    if success:
+                        # Query assigned immediately
+                        self._start_query(index, cluster, current_time)
+                    else:
+                        # Query must wait in queue
+                        self.query_queue.append(index)
                 
-                query_index += 1
+                query_index = arrived
+                next_arrival = float(arrival_times[arrived]) if arrived < num_queries else math.inf
             
             # Process query completions
-            completed_queries = []
-            for query_id, (query, cluster, start) in list(self.active_queries.items()):
-                if current_time >= start + query.duration:
-                    # Query completed
-                    self.warehouse.release_query(cluster, current_time)
-                    completed_queries.append(query_id)
-                    queries_processed += 1
-                    
-                    # Update execution record
-                    for exec_record in self.query_executions:
-                        if exec_record.query.query_id == query_id:
-                            exec_record.completed_time = current_time
-                            break
-                    
-                    # Track GenAI DBU usage
-                    if query.uses_genai:
-                        self.genai_dbus += self.config.genie.genai_dbu_per_call
-            
-            for query_id in completed_queries:
-                del self.active_queries[query_id]
+            while completions and completions[0][0] <= current_time:
+                _, index, cluster = heapq.heappop(completions)
+                self.warehouse.release_query(cluster, current_time)
+                queries_processed += 1
+                
+                # Update execution record
+                completed_time[index] = current_time
+                
+                # Track GenAI DBU usage
+                if all_queries[index].uses_genai:
+                    self.genai_dbus += self.config.genie.genai_dbu_per_call
             
             # Progress logging based on queries processed
-            if self.config.enable_progress_logging and self.config.progress_log_interval > 0:
+            if progress_logging:
                 if queries_processed - last_progress_count >= self.config.progress_log_interval:
-                    progress_pct = (queries_processed / len(all_queries)) * 100
+                    progress_pct = (queries_processed / num_queries) * 100
                     day = current_time / 86400
                     self.logger.info(
-                        f"Progress: {queries_processed}/{len(all_queries)} queries processed "
-                        f"({progress_pct:.1f}%) - Day {day:.1f}/{self.config.simulation_days} - "
-                        f"Active: {len(self.active_queries)}, Queued: {len(self.query_queue)}, "
-                        f"Clusters: {len(self.warehouse.clusters)}"
+                        "Progress: %d/%d queries processed (%.1f%%) - Day %.1f/%s - "
+                        "Active: %d, Queued: %d, Clusters: %d",
+                        queries_processed, num_queries, progress_pct,
+                        day, self.config.simulation_days,
+                        len(self.active_queries), len(self.query_queue),
+                        len(self.warehouse.clusters)
                     )
                     last_progress_count = queries_processed
             
-            # Process query queue - try to assign waiting queries
-            remaining_queue = []
-            for query in self.query_queue:
+            # Process query queue - assign waiting queries in FIFO order. Once
+            # an assignment fails the warehouse state is unchanged, so every
+            # later query in the queue would fail too
+            while self.query_queue:
                 success, cluster = self.warehouse.assign_query(current_time)
-                if success:
-                    self.active_queries[query.query_id] = (query, cluster, current_time)
-                    self.query_executions.append(QueryExecution(
-                        query=query,
-                        assigned_time=current_time,
-                        cluster_id=cluster.cluster_id if cluster else None
-                    ))
-                else:
-                    remaining_queue.append(query)
-            
-            self.query_queue = remaining_queue
+                if not success:
+                    break
+                self._start_query(self.query_queue.popleft(), cluster, current_time)
             
             # Update warehouse state and scaling
             self.warehouse.update_state(current_time)
             
-            # Calculate DBU consumption for this time step
-            if current_time > 0:
-                time_delta = self.config.time_step_seconds
-                dbus = self.warehouse.calculate_dbu_consumption(time_delta)
-                self.total_dbus += dbus
+            # Count the clusters billed for this time step
+            num_clusters = len(self.warehouse.clusters)
+            if tick > 0:
+                cluster_steps += num_clusters
             
             # Record state periodically
-            if current_time - last_state_record >= state_record_interval:
+            if tick >= next_record_tick:
+                self.total_dbus = cluster_steps * dbus_per_cluster_step
                 self.warehouse.record_state(
                     current_time,
                     queued_queries=len(self.query_queue),
                     dbu_consumption=self.total_dbus,
                     genai_dbu_consumption=self.genai_dbus
                 )
-                last_state_record = current_time
+                next_record_tick = self._first_tick(current_time + STATE_RECORD_INTERVAL)
+            
+            # Advance time to the next step where something can happen
+            if self.query_queue or not (query_index < num_queries or self.active_queries):
+                next_tick = tick + 1
+            else:
+                next_tick = max_tick
+                if next_arrival < math.inf:
+                    next_tick = min(next_tick, self._first_tick(next_arrival))
+                if completions:
+                    next_tick = min(next_tick, self._first_tick(completions[0][0]))
+                next_tick = min(next_tick, next_record_tick)
+                
+                # Warehouse timers are visited one step early to absorb
+                # rounding; an early visit changes nothing
+                next_change = self.warehouse.next_state_change(current_time)
+                if next_change < math.inf:
+                    next_tick = min(next_tick, self._first_tick(next_change) - 1)
+                
+                next_tick = max(next_tick, tick + 1)
+            
+            # Skipped steps bill the same clusters as this one
+            cluster_steps += num_clusters * (next_tick - tick - 1)
             
-            # Advance time
-            current_time += self.config.time_step_seconds
+            tick = next_tick
+            current_time = tick * time_step
             
-            # Progress logging
-            if int(current_time) % 86400 == 0:  # Every day
-                day = int(current_time / 86400)
-                self.logger.info(f"Completed day {day}/{self.config.simulation_days}")
+            # Progress logging, once per day boundary crossed
+            while current_time >= next_log_time:
+                self.logger.info("Completed day %d/%s", int(next_log_time // 86400), self.config.simulation_days)
+                next_log_time += 86400.0
+        
+        self.total_dbus = cluster_steps * dbus_per_cluster_step
         
         self.logger.info("Simulation complete, calculating metrics...")
         
@@ -256,6 +349,44 @@ class Simulator:
         
         return metrics
     
+    def _first_tick(self, time: float) -> int:
+        """Index of the first time step at or after time (steps are tick * time_step_seconds)."""
+        time_step = self.config.time_step_seconds
+        tick = max(0, math.ceil(time / time_step))
+        
+        # Correct for rounding in the division so the result agrees with
+        # comparisons against tick * time_step
+        while tick * time_step < time:
+            tick += 1
+        while tick > 0 and (tick - 1) * time_step >= time:
+            tick -= 1
+        return tick
+    
+    def _start_query(self, index: int, cluster: ClusterState, current_time: float):
+        """Record query index starting on cluster and schedule its completion."""
+        self.executions.assigned_time[index] = current_time
+        self.executions.cluster_id[index] = cluster.cluster_id
+        # Query indices are unique, so heap entries never compare clusters
+        heapq.heappush(self.active_queries, (current_time + self.queries[index].duration, index, cluster))
+    
+    @property
+    def query_executions(self) -> List[QueryExecution]:
+        """Execution records of all assigned queries, built from self.executions."""
+        executions = self.executions
+        if executions is None:
+            return []
+        
+        records = []
+        for i in np.flatnonzero(~np.isnan(executions.assigned_time)).tolist():
+            completed_time = executions.completed_time[i]
+            records.append(QueryExecution(
+                query=self.queries[i],
+                assigned_time=float(executions.assigned_time[i]),
+                completed_time=None if np.isnan(completed_time) else float(completed_time),
+                cluster_id=int(executions.cluster_id[i])
+            ))
+        return records
+    
     def _calculate_metrics(self) -> SimulationMetrics:
         """Calculate aggregated metrics from simulation results."""
         metrics = SimulationMetrics()
@@ -269,61 +400,92 @@ class Simulator:
         metrics.genai_cost = self.genai_dbus * self.config.pricing.serverless_realtime_inference_dbu_rate
         metrics.total_cost = metrics.sql_cost + metrics.genai_cost
         
-        # Query counts
-        metrics.total_queries = len(self.query_executions)
-        metrics.dashboard_queries = sum(1 for e in self.query_executions if e.query.query_type == "dashboard")
-        metrics.genie_queries = sum(1 for e in self.query_executions if e.query.query_type == "genie")
-        metrics.genai_queries = sum(1 for e in self.query_executions if e.query.uses_genai)
+        # Query counts (queries still queued at the end were never executed)
+        executions = self.executions
+        assigned = ~np.isnan(executions.assigned_time)
+        completed = ~np.isnan(executions.completed_time)
+        is_dashboard = executions.query_type == QUERY_TYPE_CODES["dashboard"]
+        is_genie = executions.query_type == QUERY_TYPE_CODES["genie"]
+        
+        metrics.total_queries = int(np.count_nonzero(assigned))
+        metrics.dashboard_queries = int(np.count_nonzero(assigned & is_dashboard))
+        metrics.genie_queries = int(np.count_nonzero(assigned & is_genie))
+        metrics.genai_queries = int(np.count_nonzero(assigned & executions.uses_genai))
         
         # Wait time metrics
-        wait_times = [e.wait_time for e in self.query_executions if e.completed_time is not None]
-        genie_wait_times = [e.wait_time for e in self.query_executions 
-                           if e.query.query_type == "genie" and e.completed_time is not None]
-        dashboard_wait_times = [e.wait_time for e in self.query_executions 
-                               if e.query.query_type == "dashboard" and e.completed_time is not None]
-        
-        if wait_times:
-            metrics.avg_wait_time = np.mean(wait_times)
-            metrics.p50_wait_time = np.percentile(wait_times, 50)
-            metrics.p95_wait_time = np.percentile(wait_times, 95)
-            metrics.p99_wait_time = np.percentile(wait_times, 99)
-            metrics.max_wait_time = np.max(wait_times)
-            metrics.wait_times = wait_times
-        
-        if genie_wait_times:
-            metrics.genie_avg_wait_time = np.mean(genie_wait_times)
-            metrics.genie_p50_wait_time = np.percentile(genie_wait_times, 50)
-            metrics.genie_p95_wait_time = np.percentile(genie_wait_times, 95)
-            metrics.genie_p99_wait_time = np.percentile(genie_wait_times, 99)
-            metrics.genie_wait_times = genie_wait_times
-        
-        if dashboard_wait_times:
-            metrics.dashboard_avg_wait_time = np.mean(dashboard_wait_times)
+        all_wait_times = executions.assigned_time - executions.start_time
+        wait_times = all_wait_times[completed]
+        genie_wait_times = all_wait_times[completed & is_genie]
+        dashboard_wait_times = all_wait_times[completed & is_dashboard]
+        
+        if wait_times.size:
+            metrics.avg_wait_time = wait_times.mean()
+            # One percentile call sorts each array once for all quantiles;
+            # the 100th percentile is the maximum
+            p50, p95, p99, p100 = np.percentile(wait_times, [50, 95, 99, 100])
+            metrics.p50_wait_time = p50
+            metrics.p95_wait_time = p95
+            metrics.p99_wait_time = p99
+            metrics.max_wait_time = p100
+            metrics.wait_times = wait_times.tolist()
+        
+        if genie_wait_times.size:
+            metrics.genie_avg_wait_time = genie_wait_times.mean()
+            p50, p95, p99 = np.percentile(genie_wait_times, [50, 95, 99])
+            metrics.genie_p50_wait_time = p50
+            metrics.genie_p95_wait_time = p95
+            metrics.genie_p99_wait_time = p99
+            metrics.genie_wait_times = genie_wait_times.tolist()
+        
+        if dashboard_wait_times.size:
+            metrics.dashboard_avg_wait_time = dashboard_wait_times.mean()
             metrics.dashboard_p95_wait_time = np.percentile(dashboard_wait_times, 95)
-            metrics.dashboard_wait_times = dashboard_wait_times
+            metrics.dashboard_wait_times = dashboard_wait_times.tolist()
         
         # Warehouse metrics
-        state_history = self.warehouse.state_history
-        if state_history:
-            metrics.avg_clusters = np.mean([s.num_clusters for s in state_history])
-            metrics.max_clusters = max(s.num_clusters for s in state_history)
+        history = self.warehouse.state_history
+        if len(history):
+            states = history.records
+            num_clusters = states['num_clusters']
+            metrics.avg_clusters = num_clusters.mean()
+            metrics.max_clusters = int(num_clusters.max())
             
-            utilizations = [s.utilization() for s in state_history if s.total_capacity > 0]
-            if utilizations:
-                metrics.avg_utilization = np.mean(utilizations)
+            capacity = states['total_capacity']
+            has_capacity = capacity > 0
+            if has_capacity.any():
+                metrics.avg_utilization = (states['active_queries'][has_capacity] / capacity[has_capacity]).mean()
             
-            metrics.max_queue_depth = max(s.queued_queries for s in state_history)
-            metrics.state_history = state_history
+            metrics.max_queue_depth = int(states['queued_queries'].max())
+            metrics.state_history = history
         
         return metrics
 
 
-def run_simulation(config: SimulationConfig = None) -> SimulationMetrics:
+# Modules whose source determines simulation results (part of the cache key)
+_SIMULATION_SOURCES = ("config.py", "events.py", "warehouse.py", "simulator.py")
+
+
+def _simulation_cache_key(config: SimulationConfig) -> str:
+    """Hash the config together with the simulation source code."""
+    digest = hashlib.blake2b(repr(asdict(config)).encode(), digest_size=16)
+    package_dir = Path(__file__).parent
+    for source in _SIMULATION_SOURCES:
+        digest.update((package_dir / source).read_bytes())
+    return digest.hexdigest()
+
+
+def run_simulation(config: SimulationConfig = None, cache_dir: Optional[str] = None) -> SimulationMetrics:
     """
     Convenience function to run a simulation.
     
+    Queries are drawn from a generator seeded with config.random_seed, so a
+    given config always produces the same results.
+    
     Args:
         config: Simulation configuration (uses default if None)
+        cache_dir: Directory for caching results on disk. When set, a run
+            with an identical config and simulation code is loaded from the
+            cache instead of being simulated again.
     
     Returns:
         SimulationMetrics with all results
@@ -332,6 +494,139 @@ def run_simulation(config: SimulationConfig = None) -> SimulationMetrics:
         from .config import create_default_config
         config = create_default_config()
     
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"{_simulation_cache_key(config)}.pkl"
+        if cache_file.exists():
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+    
     simulator = Simulator(config)
-    return simulator.run()
+    metrics = simulator.run()
+    
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of its own, so concurrent runs of the same config never
+        # write into one file; the rename then swaps in a complete pickle
+        with tempfile.NamedTemporaryFile(dir=cache_file.parent, suffix='.tmp', delete=False) as f:
+            try:
+                pickle.dump(metrics, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, cache_file)
+    
+    return metrics
+
+
+
+# Config sections a sweep may override without changing the generated workload
+_SWEEP_SECTIONS = ("warehouse", "pricing")
+
+# Unscaled workload shared with sweep worker processes
+_sweep_workload: Optional[Tuple[List[Query], List[Query]]] = None
+
 
+def _apply_overrides(config: SimulationConfig, overrides: Dict[str, Dict]) -> SimulationConfig:
+    """Return a copy of config with per-section field overrides applied."""
+    sections = {}
+    for section, fields in overrides.items():
+        if section not in _SWEEP_SECTIONS:
+            raise ValueError(
+                f"Cannot override '{section}' in a sweep; "
+                f"only {', '.join(_SWEEP_SECTIONS)} may vary"
+            )
+        sections[section] = replace(getattr(config, section), **fields)
+    
+    # The top-level config was validated when it was built; only the
+    # overridden sections above need their checks re-run
+    with bypass_validators():
+        return replace(config, **sections)
+
+
+def _init_sweep_worker(workload: Tuple[List[Query], List[Query]]):
+    """Receive the shared workload once per worker process."""
+    global _sweep_workload
+    _sweep_workload = workload
+
+
+def _run_sweep_point(config: SimulationConfig,
+                     workload: Optional[Tuple[List[Query], List[Query]]] = None) -> SimulationMetrics:
+    """Simulate one sweep configuration against the shared unscaled workload."""
+    if workload is None:
+        workload = _sweep_workload
+    
+    # Warehouse size only rescales query durations
+    multiplier = _size_performance_multiplier(config.warehouse.dbus_per_hour)
+    scaled = tuple(
+        [Query(q.query_id, q.query_type, q.start_time, q.duration * multiplier, q.uses_genai)
+         for q in queries]
+        for queries in workload
+    )
+    
+    return Simulator(config).run(workload=scaled)
+
+
+def run_simulation_sweep(config: SimulationConfig, param_overrides: List[Dict[str, Dict]],
+                         max_workers: int = 1) -> List[SimulationMetrics]:
+    """
+    Run one simulation per override, generating the query workload only once.
+    
+    Each override maps a config section to field overrides, for example
+    ``{"warehouse": {"size": "Large"}}``. Only the warehouse and pricing
+    sections may vary, since the same arrivals are replayed for every run.
+    
+    Args:
+        config: Base simulation configuration
+        param_overrides: Section overrides for each run
+        max_workers: Number of worker processes (1 runs in-process)
+    
+    Returns:
+        SimulationMetrics for each override, in order
+    """
+    configs = [_apply_overrides(config, overrides) for overrides in param_overrides]
+    
+    workload = EventGenerator(config, performance_multiplier=1.0).generate_all_queries()
+    
+    if max_workers <= 1:
+        return [_run_sweep_point(c, workload) for c in configs]
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sweep_worker,
+                             initargs=(workload,)) as executor:
+        return list(executor.map(_run_sweep_point, configs))
+
+
+def _run_replica(config: SimulationConfig) -> SimulationMetrics:
+    """Simulate one independent replica of a batch."""
+    return Simulator(config).run()
+
+
+def run_simulations_batch(configs: List[SimulationConfig], seeds: Sequence[int],
+                          max_workers: int = 1) -> List[SimulationMetrics]:
+    """
+    Run independent simulation replicas, optionally across worker processes.
+    
+    Replica i simulates configs[i] with its random_seed replaced by seeds[i],
+    so the results are the same whichever worker runs a replica.
+    
+    Args:
+        configs: Simulation configuration for each replica
+        seeds: Random seed for each replica
+        max_workers: Number of worker processes (1 runs in-process)
+    
+    Returns:
+        SimulationMetrics for each replica, in order
+    """
+    if len(configs) != len(seeds):
+        raise ValueError(f"Got {len(configs)} configs but {len(seeds)} seeds")
+    
+    # Only the seed changes, and the configs were validated when built
+    with bypass_validators():
+        replicas = [replace(config, random_seed=int(seed)) for config, seed in zip(configs, seeds)]
+    
+    if max_workers <= 1:
+        return [_run_replica(c) for c in replicas]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_replica, replicas))
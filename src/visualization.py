@@ -2,15 +2,104 @@
 Visualization and reporting for simulation results.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple, TYPE_CHECKING
 import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from .simulator import SimulationMetrics
+from .warehouse import StateHistory
 from .config import SimulationConfig
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Fast zlib setting for the report PNGs: same pixels, a fraction of the
+# encoding time, somewhat larger files
+PNG_SAVE_KWARGS = {'optimize': False, 'compress_level': 1}
+
+
+# Time series are thinned to about this many points before plotting, roughly
+# twice the pixel width of a summary panel
+DOWNSAMPLE_TARGET = 2000
+
+
+def downsample(times: np.ndarray, y: np.ndarray, envelope: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Thin a time series to about DOWNSAMPLE_TARGET points for plotting.
+    
+    Args:
+        times: Sample times
+        y: Values aligned with times
+        envelope: Keep the minimum and maximum of each bucket rather
+            than evenly spaced samples, so spikes and dips survive
+    
+    Returns:
+        Tuple of (times, values)
+    """
+    if len(y) < 2 * DOWNSAMPLE_TARGET:
+        return times, y
+    
+    if not envelope:
+        step = len(y) // DOWNSAMPLE_TARGET
+        return times[::step], y[::step]
+    
+    # Two points per bucket: its minimum, then its maximum half a bucket on
+    step = len(y) // (DOWNSAMPLE_TARGET // 2)
+    starts = np.arange(0, len(y), step)
+    mids = np.minimum(starts + step // 2, len(y) - 1)
+    times = np.column_stack((times[starts], times[mids])).ravel()
+    values = np.column_stack((np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts))).ravel()
+    return times, values
+
+
+def load_state_history(output_path: Path, columns: List[str], dtype) -> "pd.DataFrame":
+    """
+    Load columns of the state history written by save_csv_reports.
+    
+    Reads the Parquet copy when there is no CSV or it is at least as new as
+    the CSV, and pyarrow is installed; otherwise parses the CSV.
+    
+    Args:
+        output_path: Results directory holding warehouse_state_history.*
+        columns: Columns to load
+        dtype: NumPy dtype to parse the CSV columns as
+    
+    Returns:
+        DataFrame with the requested columns
+    """
+    import pandas as pd
+    
+    csv_file = output_path / 'warehouse_state_history.csv'
+    parquet_file = output_path / 'warehouse_state_history.parquet'
+    
+    if parquet_file.exists() and (
+            not csv_file.exists() or parquet_file.stat().st_mtime >= csv_file.stat().st_mtime):
+        try:
+            return pd.read_parquet(parquet_file, columns=columns)
+        except ImportError:
+            pass
+    
+    # Only parse the requested columns
+    return pd.read_csv(csv_file, usecols=columns, dtype={c: dtype for c in columns})
+
+
+# Warehouse sizes on the cost comparison chart, with their cost relative to
+# Medium (24 DBUs/hour)
+_SIZE_MULTIPLIERS = (
+    ('2XSmall', 0.167),
+    ('XSmall', 0.25),
+    ('Small', 0.5),
+    ('Medium', 1.0),
+    ('Large', 1.67),
+    ('XLarge', 3.33),
+)
+_SIZE_NAMES = tuple(name for name, _ in _SIZE_MULTIPLIERS)
+_SIZE_INDEX = {name: i for i, name in enumerate(_SIZE_NAMES)}
+
 
 class SimulationReporter:
     """Generate reports and visualizations from simulation results."""
@@ -19,153 +108,250 @@ class SimulationReporter:
         self.config = config
         self.metrics = metrics
         self.logger = logging.getLogger(__name__)
+        
+        # State history columns, extracted on first use by _ensure_arrays
+        self._state: Optional[np.ndarray] = None
+        # Sorted Genie wait times, shared by the histograms, CDF and percentiles
+        self._wait_sorted: Optional[np.ndarray] = None
+        self._wait_histogram: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # Output directories this reporter has already created
+        self._output_dirs = set()
+    
+    def _output_path(self, output_dir) -> Path:
+        """Output directory as a Path, created on first use by this reporter."""
+        output_path = Path(output_dir)
+        if output_path not in self._output_dirs:
+            output_path.mkdir(parents=True, exist_ok=True)
+            self._output_dirs.add(output_path)
+        return output_path
+    
+    def _ensure_arrays(self):
+        """Cache the state history columns and the series derived from them, once."""
+        if self._state is not None:
+            return
+        
+        # The history already stores its states as structured array rows;
+        # a plain list of states (e.g. hand-built metrics) is converted once
+        history = self.metrics.state_history
+        if not isinstance(history, StateHistory):
+            history = StateHistory.from_states(history)
+        self._state = history.records
+        self._times_h = self._state['time'] / 3600  # Convert to hours
+        self._clusters = self._state['num_clusters']
+        self._active = self._state['active_queries']
+        self._queued = self._state['queued_queries']
+        self._capacity = self._state['total_capacity']
+        self._dbus = self._state['dbu_consumption']
+        # Utilization (%) in one division; no capacity means no clusters and
+        # so no active queries, which comes out as 0%
+        self._util_pct = self._active / np.maximum(self._capacity, 1) * 100
+    
+    def _downsample(self, y: np.ndarray, envelope: bool = False):
+        """Thin a state history series with downsample (times in hours, values)."""
+        return downsample(self._times_h, y, envelope)
+    
+    def _sorted_genie_wait_times(self) -> np.ndarray:
+        """Genie wait times as a sorted array, computed once."""
+        if self._wait_sorted is None:
+            wait_times = self.metrics.genie_wait_times
+            self._wait_sorted = np.sort(np.fromiter(wait_times, dtype=np.float64, count=len(wait_times)))
+        return self._wait_sorted
+    
+    def _genie_wait_histogram(self):
+        """50-bin histogram of the Genie wait times as (counts, edges), computed once."""
+        if self._wait_histogram is None:
+            self._wait_histogram = np.histogram(self._sorted_genie_wait_times(), bins=50)
+        return self._wait_histogram
     
     def print_summary(self):
         """Print a text summary of simulation results."""
-        print("\n" + "=" * 80)
-        print("DATABRICKS SERVERLESS SQL WAREHOUSE - COST SIMULATION RESULTS")
-        print("=" * 80)
-        
-        print(f"\n{'SIMULATION PARAMETERS':-^80}")
-        print(f"  Duration: {self.config.simulation_days} days")
-        print(f"  Warehouse Size: {self.config.warehouse.size} ({self.config.warehouse.dbus_per_hour} DBUs/hour/cluster)")
-        print(f"  Target Concurrency: {self.config.warehouse.target_concurrency_per_cluster} queries/cluster")
-        print(f"  Dashboards: {self.config.dashboard.num_dashboards}")
-        print(f"  Dashboard Refreshes/Day: {self.config.dashboard.refreshes_per_day}")
-        print(f"  Peak Concurrent Users: {self.config.genie.peak_concurrent_users_min}-{self.config.genie.peak_concurrent_users_max}")
-        print(f"  Queries/User/Hour: {self.config.genie.avg_queries_per_user_per_hour}")
-        
-        print(f"\n{'COST ANALYSIS':-^80}")
-        print(f"  Total DBUs Consumed: {self.metrics.total_dbus:,.2f}")
-        print(f"    - SQL Compute DBUs: {self.metrics.sql_dbus:,.2f}")
-        print(f"    - GenAI Inference DBUs: {self.metrics.genai_dbus:,.2f}")
-        print(f"  ")
-        print(f"  Total Cost: ${self.metrics.total_cost:,.2f}")
-        print(f"    - SQL Compute Cost: ${self.metrics.sql_cost:,.2f} (@ ${self.config.pricing.sql_serverless_dbu_rate}/DBU)")
-        print(f"    - GenAI Inference Cost: ${self.metrics.genai_cost:,.2f} (@ ${self.config.pricing.serverless_realtime_inference_dbu_rate}/DBU)")
-        print(f"  ")
-        print(f"  Daily Average Cost: ${self.metrics.total_cost / self.config.simulation_days:,.2f}")
-        print(f"  Monthly Projected Cost (30 days): ${self.metrics.total_cost / self.config.simulation_days * 30:,.2f}")
-        print(f"  Annual Projected Cost (365 days): ${self.metrics.total_cost / self.config.simulation_days * 365:,.2f}")
-        
-        print(f"\n{'WORKLOAD ANALYSIS':-^80}")
-        print(f"  Total Queries Executed: {self.metrics.total_queries:,}")
+        # Build the whole report and write it in one go
+        lines = []
+        out = lines.append
+        
+        out("\n" + "=" * 80 + "\n")
+        out("DATABRICKS SERVERLESS SQL WAREHOUSE - COST SIMULATION RESULTS\n")
+        out("=" * 80 + "\n")
+        
+        out(f"\n{'SIMULATION PARAMETERS':-^80}\n")
+        out(f"  Duration: {self.config.simulation_days} days\n")
+        out(f"  Warehouse Size: {self.config.warehouse.size} ({self.config.warehouse.dbus_per_hour} DBUs/hour/cluster)\n")
+        out(f"  Target Concurrency: {self.config.warehouse.target_concurrency_per_cluster} queries/cluster\n")
+        out(f"  Dashboards: {self.config.dashboard.num_dashboards}\n")
+        out(f"  Dashboard Refreshes/Day: {self.config.dashboard.refreshes_per_day}\n")
+        out(f"  Peak Concurrent Users: {self.config.genie.peak_concurrent_users_min}-{self.config.genie.peak_concurrent_users_max}\n")
+        out(f"  Queries/User/Hour: {self.config.genie.avg_queries_per_user_per_hour}\n")
+        
+        out(f"\n{'COST ANALYSIS':-^80}\n")
+        out(f"  Total DBUs Consumed: {self.metrics.total_dbus:,.2f}\n")
+        out(f"    - SQL Compute DBUs: {self.metrics.sql_dbus:,.2f}\n")
+        out(f"    - GenAI Inference DBUs: {self.metrics.genai_dbus:,.2f}\n")
+        out(f"  \n")
+        out(f"  Total Cost: ${self.metrics.total_cost:,.2f}\n")
+        out(f"    - SQL Compute Cost: ${self.metrics.sql_cost:,.2f} (@ ${self.config.pricing.sql_serverless_dbu_rate}/DBU)\n")
+        out(f"    - GenAI Inference Cost: ${self.metrics.genai_cost:,.2f} (@ ${self.config.pricing.serverless_realtime_inference_dbu_rate}/DBU)\n")
+        out(f"  \n")
+        out(f"  Daily Average Cost: ${self.metrics.total_cost / self.config.simulation_days:,.2f}\n")
+        out(f"  Monthly Projected Cost (30 days): ${self.metrics.total_cost / self.config.simulation_days * 30:,.2f}\n")
+        out(f"  Annual Projected Cost (365 days): ${self.metrics.total_cost / self.config.simulation_days * 365:,.2f}\n")
+        
+        out(f"\n{'WORKLOAD ANALYSIS':-^80}\n")
+        out(f"  Total Queries Executed: {self.metrics.total_queries:,}\n")
         
         if self.metrics.total_queries > 0:
-            print(f"    - Dashboard Queries: {self.metrics.dashboard_queries:,} ({self.metrics.dashboard_queries/self.metrics.total_queries*100:.1f}%)")
-            print(f"    - Genie Queries: {self.metrics.genie_queries:,} ({self.metrics.genie_queries/self.metrics.total_queries*100:.1f}%)")
-            print(f"    - GenAI-enabled Queries: {self.metrics.genai_queries:,} ({self.metrics.genai_queries/self.metrics.total_queries*100:.1f}%)")
-            print(f"  ")
-            print(f"  Queries per Day: {self.metrics.total_queries / self.config.simulation_days:,.0f}")
-            print(f"  Average DBUs per Query: {self.metrics.total_dbus / self.metrics.total_queries:.4f}")
-            print(f"  Average Cost per Query: ${self.metrics.total_cost / self.metrics.total_queries:.4f}")
+            out(f"    - Dashboard Queries: {self.metrics.dashboard_queries:,} ({self.metrics.dashboard_queries/self.metrics.total_queries*100:.1f}%)\n")
+            out(f"    - Genie Queries: {self.metrics.genie_queries:,} ({self.metrics.genie_queries/self.metrics.total_queries*100:.1f}%)\n")
+            out(f"    - GenAI-enabled Queries: {self.metrics.genai_queries:,} ({self.metrics.genai_queries/self.metrics.total_queries*100:.1f}%)\n")
+            out(f"  \n")
+            out(f"  Queries per Day: {self.metrics.total_queries / self.config.simulation_days:,.0f}\n")
+            out(f"  Average DBUs per Query: {self.metrics.total_dbus / self.metrics.total_queries:.4f}\n")
+            out(f"  Average Cost per Query: ${self.metrics.total_cost / self.metrics.total_queries:.4f}\n")
         else:
-            print(f"    ⚠️  WARNING: No queries were executed!")
-            print(f"    This may indicate a simulation configuration issue.")
+            out(f"    ⚠️  WARNING: No queries were executed!\n")
+            out(f"    This may indicate a simulation configuration issue.\n")
         
-        print(f"\n{'PERFORMANCE METRICS (GENIE QUERIES - USER EXPERIENCE)':-^80}")
-        print(f"  Wait Time Statistics:")
-        print(f"    - Average Wait: {self.metrics.genie_avg_wait_time:.2f} seconds")
-        print(f"    - P50 Wait: {self.metrics.genie_p50_wait_time:.2f} seconds")
-        print(f"    - P95 Wait: {self.metrics.genie_p95_wait_time:.2f} seconds")
-        print(f"    - P99 Wait: {self.metrics.genie_p99_wait_time:.2f} seconds")
+        out(f"\n{'PERFORMANCE METRICS (GENIE QUERIES - USER EXPERIENCE)':-^80}\n")
+        out(f"  Wait Time Statistics:\n")
+        out(f"    - Average Wait: {self.metrics.genie_avg_wait_time:.2f} seconds\n")
+        out(f"    - P50 Wait: {self.metrics.genie_p50_wait_time:.2f} seconds\n")
+        out(f"    - P95 Wait: {self.metrics.genie_p95_wait_time:.2f} seconds\n")
+        out(f"    - P99 Wait: {self.metrics.genie_p99_wait_time:.2f} seconds\n")
         
         if self.metrics.genie_p95_wait_time > 5.0:
-            print(f"  ⚠️  WARNING: P95 wait time exceeds 5 seconds - consider scaling up")
+            out(f"  ⚠️  WARNING: P95 wait time exceeds 5 seconds - consider scaling up\n")
         elif self.metrics.genie_p95_wait_time > 2.0:
-            print(f"  ⚠️  NOTICE: P95 wait time exceeds 2 seconds - monitor user experience")
+            out(f"  ⚠️  NOTICE: P95 wait time exceeds 2 seconds - monitor user experience\n")
         else:
-            print(f"  ✓ P95 wait time is acceptable for interactive queries")
+            out(f"  ✓ P95 wait time is acceptable for interactive queries\n")
         
-        print(f"\n{'PERFORMANCE METRICS (DASHBOARD REFRESHES)':-^80}")
-        print(f"  Wait Time Statistics:")
-        print(f"    - Average Wait: {self.metrics.dashboard_avg_wait_time:.2f} seconds")
-        print(f"    - P95 Wait: {self.metrics.dashboard_p95_wait_time:.2f} seconds")
+        out(f"\n{'PERFORMANCE METRICS (DASHBOARD REFRESHES)':-^80}\n")
+        out(f"  Wait Time Statistics:\n")
+        out(f"    - Average Wait: {self.metrics.dashboard_avg_wait_time:.2f} seconds\n")
+        out(f"    - P95 Wait: {self.metrics.dashboard_p95_wait_time:.2f} seconds\n")
         
-        print(f"\n{'WAREHOUSE SCALING BEHAVIOR':-^80}")
-        print(f"  Average Active Clusters: {self.metrics.avg_clusters:.2f}")
-        print(f"  Peak Clusters: {self.metrics.max_clusters}")
-        print(f"  Average Utilization: {self.metrics.avg_utilization*100:.1f}%")
-        print(f"  Max Queue Depth: {self.metrics.max_queue_depth}")
+        out(f"\n{'WAREHOUSE SCALING BEHAVIOR':-^80}\n")
+        out(f"  Average Active Clusters: {self.metrics.avg_clusters:.2f}\n")
+        out(f"  Peak Clusters: {self.metrics.max_clusters}\n")
+        out(f"  Average Utilization: {self.metrics.avg_utilization*100:.1f}%\n")
+        out(f"  Max Queue Depth: {self.metrics.max_queue_depth}\n")
         
         if self.metrics.avg_utilization < 0.3:
-            print(f"  💡 TIP: Low utilization - consider smaller warehouse size")
+            out(f"  💡 TIP: Low utilization - consider smaller warehouse size\n")
         elif self.metrics.avg_utilization > 0.8:
-            print(f"  💡 TIP: High utilization - warehouse is right-sized or may benefit from larger size")
+            out(f"  💡 TIP: High utilization - warehouse is right-sized or may benefit from larger size\n")
         
         if self.metrics.max_queue_depth > 10:
-            print(f"  ⚠️  WARNING: Significant queuing detected - consider larger warehouse or more clusters")
+            out(f"  ⚠️  WARNING: Significant queuing detected - consider larger warehouse or more clusters\n")
         
-        print("\n" + "=" * 80 + "\n")
+        out("\n" + "=" * 80 + "\n\n")
+        
+        sys.stdout.write("".join(lines))
     
-    def create_visualizations(self, output_dir: str = "results"):
+    def create_visualizations(self, output_dir: str = "results", summary_dpi: int = 150,
+                              max_workers: int = 1):
         """
         Create comprehensive visualization charts.
         
         Args:
             output_dir: Directory to save charts
+            summary_dpi: Resolution of the nine-panel summary figure; lower
+                values render noticeably faster
+            max_workers: Number of worker processes rendering the three
+                figures (1 renders them in-process, one after another)
         """
-        output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        output_path = self._output_path(output_dir)
+        
+        self.logger.info("Creating visualizations in %s", output_path)
+        
+        # Only queue figures that have data, so a skipped chart never costs a
+        # Figure (or a worker process)
+        charts = [(self._create_summary_chart, (output_path, summary_dpi))]
+        if self.metrics.genie_wait_times:
+            charts.append((self._create_detailed_wait_time_chart, (output_path,)))
+        charts.append((self._create_cost_projection_chart, (output_path,)))
         
-        self.logger.info(f"Creating visualizations in {output_path}")
+        if max_workers <= 1:
+            for create_chart, args in charts:
+                create_chart(*args)
+            return
+        
+        # The figures share no state; extract the plotted arrays first so
+        # each worker receives them instead of recomputing them
+        if self.metrics.state_history:
+            self._ensure_arrays()
+        if self.metrics.genie_wait_times:
+            self._genie_wait_histogram()
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(create_chart, *args) for create_chart, args in charts]
+            for future in futures:
+                future.result()
+    
+    def _create_summary_chart(self, output_path: Path, dpi: int):
+        """Create the nine-panel summary figure."""
+        # matplotlib is imported only when a figure is drawn, so the text and
+        # CSV reports never pay its import cost. A bare Figure renders with
+        # Agg and never touches pyplot's GUI backend or figure registry
+        from matplotlib.figure import Figure
+        
+        # Long histories are plotted thinned (see _downsample); the CSV and
+        # Parquet exports keep every sample
+        num_states = len(self.metrics.state_history)
+        if num_states >= 2 * DOWNSAMPLE_TARGET:
+            self.logger.info("Plotting %d state samples thinned to about %d points per series",
+                             num_states, DOWNSAMPLE_TARGET)
         
         # Create a comprehensive multi-panel figure
-        fig = plt.figure(figsize=(20, 12))
+        fig = Figure(figsize=(20, 12))
         
         # 1. Warehouse scaling over time
-        ax1 = plt.subplot(3, 3, 1)
+        ax1 = fig.add_subplot(3, 3, 1)
         self._plot_warehouse_scaling(ax1)
         
         # 2. DBU consumption over time
-        ax2 = plt.subplot(3, 3, 2)
+        ax2 = fig.add_subplot(3, 3, 2)
         self._plot_dbu_consumption(ax2)
         
         # 3. Queue depth over time
-        ax3 = plt.subplot(3, 3, 3)
+        ax3 = fig.add_subplot(3, 3, 3)
         self._plot_queue_depth(ax3)
         
         # 4. Utilization over time
-        ax4 = plt.subplot(3, 3, 4)
+        ax4 = fig.add_subplot(3, 3, 4)
         self._plot_utilization(ax4)
         
         # 5. Genie wait time distribution
-        ax5 = plt.subplot(3, 3, 5)
+        ax5 = fig.add_subplot(3, 3, 5)
         self._plot_genie_wait_distribution(ax5)
         
         # 6. Cost breakdown
-        ax6 = plt.subplot(3, 3, 6)
+        ax6 = fig.add_subplot(3, 3, 6)
         self._plot_cost_breakdown(ax6)
         
         # 7. Query volume by hour of day
-        ax7 = plt.subplot(3, 3, 7)
+        ax7 = fig.add_subplot(3, 3, 7)
         self._plot_query_volume_by_hour(ax7)
         
         # 8. Wait time percentiles comparison
-        ax8 = plt.subplot(3, 3, 8)
+        ax8 = fig.add_subplot(3, 3, 8)
         self._plot_wait_time_comparison(ax8)
         
         # 9. Active queries over time
-        ax9 = plt.subplot(3, 3, 9)
+        ax9 = fig.add_subplot(3, 3, 9)
         self._plot_active_queries(ax9)
         
-        plt.tight_layout()
+        fig.tight_layout()
         output_file = output_path / "simulation_results.png"
-        plt.savefig(output_file, dpi=150, bbox_inches='tight')
-        self.logger.info(f"Saved comprehensive visualization to {output_file}")
-        plt.close()
-        
-        # Create additional detailed charts
-        self._create_detailed_wait_time_chart(output_path)
-        self._create_cost_projection_chart(output_path)
+        fig.savefig(output_file, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+        self.logger.info("Saved comprehensive visualization to %s", output_file)
     
     def _plot_warehouse_scaling(self, ax):
         """Plot warehouse cluster count over time."""
         if not self.metrics.state_history:
             return
         
-        times = [s.time / 3600 for s in self.metrics.state_history]  # Convert to hours
-        clusters = [s.num_clusters for s in self.metrics.state_history]
+        self._ensure_arrays()
+        times, clusters = self._downsample(self._clusters, envelope=True)
         
         ax.plot(times, clusters, linewidth=2, color='#2E86AB')
         ax.fill_between(times, clusters, alpha=0.3, color='#2E86AB')
@@ -179,8 +365,9 @@ class SimulationReporter:
         if not self.metrics.state_history:
             return
         
-        times = [s.time / 3600 for s in self.metrics.state_history]
-        dbus = [s.dbu_consumption for s in self.metrics.state_history]
+        self._ensure_arrays()
+        # Cumulative, so evenly spaced samples keep the shape
+        times, dbus = self._downsample(self._dbus)
         
         ax.plot(times, dbus, linewidth=2, color='#A23B72')
         ax.fill_between(times, dbus, alpha=0.3, color='#A23B72')
@@ -190,7 +377,7 @@ class SimulationReporter:
         ax.grid(True, alpha=0.3)
         
         # Add cost annotation
-        total_cost = dbus[-1] * self.config.pricing.sql_serverless_dbu_rate if dbus else 0
+        total_cost = self._dbus[-1] * self.config.pricing.sql_serverless_dbu_rate
         ax.text(0.98, 0.98, f'Total: ${total_cost:,.2f}', 
                 transform=ax.transAxes, ha='right', va='top',
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
@@ -200,8 +387,8 @@ class SimulationReporter:
         if not self.metrics.state_history:
             return
         
-        times = [s.time / 3600 for s in self.metrics.state_history]
-        queue = [s.queued_queries for s in self.metrics.state_history]
+        self._ensure_arrays()
+        times, queue = self._downsample(self._queued, envelope=True)
         
         ax.plot(times, queue, linewidth=2, color='#F18F01')
         ax.fill_between(times, queue, alpha=0.3, color='#F18F01')
@@ -210,7 +397,7 @@ class SimulationReporter:
         ax.set_title('Query Queue Depth')
         ax.grid(True, alpha=0.3)
         
-        if max(queue) > 0:
+        if queue.max() > 0:
             ax.axhline(y=10, color='r', linestyle='--', alpha=0.5, label='High Queue Threshold')
             ax.legend()
     
@@ -219,8 +406,8 @@ class SimulationReporter:
         if not self.metrics.state_history:
             return
         
-        times = [s.time / 3600 for s in self.metrics.state_history]
-        utilization = [s.utilization() * 100 for s in self.metrics.state_history]
+        self._ensure_arrays()
+        times, utilization = self._downsample(self._util_pct, envelope=True)
         
         ax.plot(times, utilization, linewidth=2, color='#06A77D')
         ax.fill_between(times, utilization, alpha=0.3, color='#06A77D')
@@ -240,9 +427,10 @@ class SimulationReporter:
         if not self.metrics.genie_wait_times:
             return
         
-        wait_times = np.array(self.metrics.genie_wait_times)
+        counts, edges = self._genie_wait_histogram()
         
-        ax.hist(wait_times, bins=50, color='#4ECDC4', alpha=0.7, edgecolor='black')
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+               color='#4ECDC4', alpha=0.7, edgecolor='black')
         ax.axvline(self.metrics.genie_p95_wait_time, color='r', linestyle='--', 
                    linewidth=2, label=f'P95: {self.metrics.genie_p95_wait_time:.2f}s')
         ax.axvline(self.metrics.genie_avg_wait_time, color='green', linestyle='--', 
@@ -317,9 +505,9 @@ class SimulationReporter:
         if not self.metrics.state_history:
             return
         
-        times = [s.time / 3600 for s in self.metrics.state_history]
-        active = [s.active_queries for s in self.metrics.state_history]
-        capacity = [s.total_capacity for s in self.metrics.state_history]
+        self._ensure_arrays()
+        times, active = self._downsample(self._active, envelope=True)
+        _, capacity = self._downsample(self._capacity, envelope=True)
         
         ax.plot(times, active, linewidth=2, label='Active Queries', color='#2E86AB')
         ax.plot(times, capacity, linewidth=2, linestyle='--', label='Total Capacity', color='#06A77D')
@@ -336,11 +524,16 @@ class SimulationReporter:
         if not self.metrics.genie_wait_times:
             return
         
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(15, 10))
+        axes = fig.subplots(2, 2)
+        sorted_times = self._sorted_genie_wait_times()
         
         # Histogram
-        axes[0, 0].hist(self.metrics.genie_wait_times, bins=50, color='#4ECDC4', 
-                        alpha=0.7, edgecolor='black')
+        counts, edges = self._genie_wait_histogram()
+        axes[0, 0].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                       color='#4ECDC4', alpha=0.7, edgecolor='black')
         axes[0, 0].axvline(self.metrics.genie_p95_wait_time, color='r', 
                           linestyle='--', linewidth=2, label=f'P95: {self.metrics.genie_p95_wait_time:.2f}s')
         axes[0, 0].set_xlabel('Wait Time (seconds)')
@@ -350,9 +543,10 @@ class SimulationReporter:
         axes[0, 0].grid(True, alpha=0.3)
         
         # CDF
-        sorted_times = np.sort(self.metrics.genie_wait_times)
-        cdf = np.arange(1, len(sorted_times) + 1) / len(sorted_times)
-        axes[0, 1].plot(sorted_times, cdf * 100, linewidth=2, color='#2E86AB')
+        # Reuses the cached sorted wait times; percentages built directly
+        n = sorted_times.size
+        cdf_pct = np.linspace(100.0 / n, 100.0, n)
+        axes[0, 1].plot(sorted_times, cdf_pct, linewidth=2, color='#2E86AB')
         axes[0, 1].axhline(y=95, color='r', linestyle='--', alpha=0.5, label='P95')
         axes[0, 1].axvline(x=self.metrics.genie_p95_wait_time, color='r', 
                           linestyle='--', alpha=0.5)
@@ -363,7 +557,7 @@ class SimulationReporter:
         axes[0, 1].grid(True, alpha=0.3)
         
         # Box plot
-        axes[1, 0].boxplot([self.metrics.genie_wait_times], vert=True, patch_artist=True,
+        axes[1, 0].boxplot([sorted_times], vert=True, patch_artist=True,
                            boxprops=dict(facecolor='#4ECDC4', alpha=0.7))
         axes[1, 0].set_ylabel('Wait Time (seconds)')
         axes[1, 0].set_title('Genie Wait Time Box Plot')
@@ -373,40 +567,34 @@ class SimulationReporter:
         # Percentile table
         axes[1, 1].axis('off')
         percentiles = [50, 75, 90, 95, 99, 99.9]
-        values = [np.percentile(self.metrics.genie_wait_times, p) for p in percentiles]
-        
-        table_data = [['Percentile', 'Wait Time (s)']]
-        for p, v in zip(percentiles, values):
-            table_data.append([f'P{p}', f'{v:.3f}'])
+        values = np.percentile(sorted_times, percentiles)
         
-        table = axes[1, 1].table(cellText=table_data, cellLoc='center', loc='center',
-                                colWidths=[0.4, 0.4])
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.scale(1, 2)
-        
-        # Style header row
-        for i in range(2):
-            table[(0, i)].set_facecolor('#2E86AB')
-            table[(0, i)].set_text_props(weight='bold', color='white')
+        # One monospace text block instead of a table of per-cell artists
+        lines = ['Percentile   Wait(s)', '-' * 22]
+        lines += [f'P{p:<6}      {v:>7.3f}' for p, v in zip(percentiles, values)]
+        axes[1, 1].text(0.5, 0.5, '\n'.join(lines), family='monospace', fontsize=11,
+                        va='center', ha='center', multialignment='left',
+                        transform=axes[1, 1].transAxes)
         
         axes[1, 1].set_title('Wait Time Percentiles', pad=20)
         
-        plt.tight_layout()
+        fig.tight_layout()
         output_file = output_path / "wait_time_analysis.png"
-        plt.savefig(output_file, dpi=150, bbox_inches='tight')
-        self.logger.info(f"Saved wait time analysis to {output_file}")
-        plt.close()
+        fig.savefig(output_file, dpi=150, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+        self.logger.info("Saved wait time analysis to %s", output_file)
     
     def _create_cost_projection_chart(self, output_path: Path):
         """Create cost projection chart."""
-        fig, axes = plt.subplots(1, 2, figsize=(15, 5))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(15, 5))
+        axes = fig.subplots(1, 2)
         
         # Monthly cost projection
         months = np.arange(1, 13)
         monthly_cost = (self.metrics.total_cost / self.config.simulation_days) * 30
         
-        axes[0].bar(months, [monthly_cost] * 12, color='#2E86AB', alpha=0.7)
+        axes[0].bar(months, np.full(months.size, monthly_cost), color='#2E86AB', alpha=0.7)
         axes[0].set_xlabel('Month')
         axes[0].set_ylabel('Cost ($)')
         axes[0].set_title(f'Monthly Cost Projection: ${monthly_cost:,.2f}/month')
@@ -414,12 +602,13 @@ class SimulationReporter:
         axes[0].set_xticks(months)
         
         # Cost by warehouse size comparison (based on actual DBU rates)
-        sizes = ['2XSmall', 'XSmall', 'Small', 'Medium', 'Large', 'XLarge']
-        size_multipliers = [0.167, 0.25, 0.5, 1.0, 1.67, 3.33]  # Relative to Medium (24 DBUs/hour)
-        costs = [monthly_cost * m for m in size_multipliers]
+        costs = [multiplier * monthly_cost for _, multiplier in _SIZE_MULTIPLIERS]
         
-        colors = ['#06A77D' if s == self.config.warehouse.size else '#CCCCCC' for s in sizes]
-        axes[1].bar(sizes, costs, color=colors, alpha=0.7)
+        current_idx = _SIZE_INDEX.get(self.config.warehouse.size)
+        colors = ['#CCCCCC'] * len(_SIZE_NAMES)
+        if current_idx is not None:
+            colors[current_idx] = '#06A77D'
+        axes[1].bar(_SIZE_NAMES, costs, color=colors, alpha=0.7)
         axes[1].set_xlabel('Warehouse Size')
         axes[1].set_ylabel('Monthly Cost ($)')
         axes[1].set_title('Cost by Warehouse Size (Estimated)')
@@ -427,51 +616,83 @@ class SimulationReporter:
         axes[1].tick_params(axis='x', rotation=45)
         
         # Highlight current size if in list
-        if self.config.warehouse.size in sizes:
-            current_idx = sizes.index(self.config.warehouse.size)
+        if current_idx is not None:
             axes[1].text(current_idx, costs[current_idx], 'Current', 
                         ha='center', va='bottom', fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         output_file = output_path / "cost_projections.png"
-        plt.savefig(output_file, dpi=150, bbox_inches='tight')
-        self.logger.info(f"Saved cost projections to {output_file}")
-        plt.close()
+        fig.savefig(output_file, dpi=150, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+        self.logger.info("Saved cost projections to %s", output_file)
     
     def save_csv_reports(self, output_dir: str = "results"):
         """Save detailed CSV reports."""
         import csv
         
-        output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        output_path = self._output_path(output_dir)
         
         # State history CSV
         if self.metrics.state_history:
+            self._ensure_arrays()
             csv_file = output_path / "warehouse_state_history.csv"
-            with open(csv_file, 'w', newline='') as f:
+            with csv_file.open('w', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow(['Time (s)', 'Time (hours)', 'Clusters', 'Active Queries', 
                                'Queued Queries', 'Capacity', 'Utilization (%)', 
                                'Cumulative DBUs', 'Cumulative Cost ($)'])
                 
-                for state in self.metrics.state_history:
-                    writer.writerow([
-                        state.time,
-                        state.time / 3600,
-                        state.num_clusters,
-                        state.active_queries,
-                        state.queued_queries,
-                        state.total_capacity,
-                        state.utilization() * 100,
-                        state.dbu_consumption,
-                        state.dbu_consumption * self.config.pricing.sql_serverless_dbu_rate
-                    ])
+                # Rows come straight from the cached columns in one call
+                writer.writerows(zip(
+                    self._state['time'].tolist(),
+                    self._times_h.tolist(),
+                    self._clusters.tolist(),
+                    self._active.tolist(),
+                    self._queued.tolist(),
+                    self._capacity.tolist(),
+                    self._util_pct.tolist(),
+                    self._dbus.tolist(),
+                    (self._dbus * self.config.pricing.sql_serverless_dbu_rate).tolist()
+                ))
             
-            self.logger.info(f"Saved state history to {csv_file}")
+            self.logger.info("Saved state history to %s", csv_file)
+            
+            self._save_parquet_state_history(output_path)
+    
+    def _save_parquet_state_history(self, output_path: Path):
+        """
+        Save the state history as a columnar Parquet file alongside the CSV.
+        
+        Typed, compressed storage is much cheaper to reload than the CSV.
+        Skipped when pyarrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return
+        
+        # Columns come from the cached state arrays; counts are widened to
+        # int64 to keep the file's schema
+        self._ensure_arrays()
+        table = pa.table({
+            'Time (s)': self._state['time'],
+            'Time (hours)': self._times_h,
+            'Clusters': self._clusters.astype(np.int64),
+            'Active Queries': self._active.astype(np.int64),
+            'Queued Queries': self._queued.astype(np.int64),
+            'Capacity': self._capacity.astype(np.int64),
+            'Utilization (%)': self._util_pct,
+            'Cumulative DBUs': self._dbus,
+            'Cumulative Cost ($)': self._dbus * self.config.pricing.sql_serverless_dbu_rate,
+        })
+        
+        parquet_file = output_path / "warehouse_state_history.parquet"
+        pq.write_table(table, parquet_file, compression='zstd')
+        self.logger.info("Saved state history to %s", parquet_file)
 
 
 def generate_report(config: SimulationConfig, metrics: SimulationMetrics, 
-                   output_dir: str = "results"):
+                   output_dir: str = "results", generate_plots: bool = True):
     """
     Generate complete report with visualizations.
     
@@ -479,9 +700,11 @@ def generate_report(config: SimulationConfig, metrics: SimulationMetrics,
         config: Simulation configuration
         metrics: Simulation metrics
         output_dir: Output directory for reports
+        generate_plots: Render the PNG charts (False writes only the summary and data files)
     """
     reporter = SimulationReporter(config, metrics)
     reporter.print_summary()
-    reporter.create_visualizations(output_dir)
+    if generate_plots:
+        reporter.create_visualizations(output_dir)
     reporter.save_csv_reports(output_dir)
 
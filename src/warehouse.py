@@ -2,13 +2,31 @@
 Serverless SQL Warehouse autoscaling and resource management.
 """
 
+import math
+from fractions import Fraction
 import numpy as np
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 from dataclasses import dataclass, field
 from .config import SimulationConfig
 
 
-@dataclass
+def _cooldown_end(start: float, delay: float) -> float:
+    """
+    Earliest time t with t - start >= delay: when a cooldown begun at start ends.
+    
+    start + delay can be an ulp away from that in floating point, so it is
+    nudged until comparing a time against it agrees exactly with the
+    subtraction.
+    """
+    end = start + delay
+    while end - start < delay:
+        end = math.nextafter(end, math.inf)
+    while math.nextafter(end, -math.inf) - start >= delay:
+        end = math.nextafter(end, -math.inf)
+    return end
+
+
+@dataclass(slots=True)
 class ClusterState:
     """State of a single cluster."""
     
@@ -16,27 +34,20 @@ class ClusterState:
     active_queries: int = 0
     last_query_end_time: float = 0.0
     startup_time: float = 0.0
-    shutdown_time: float = None
+    shutdown_time: float = math.inf  # inf until the cluster is scaled down
+    
+    @property
+    def idle_since(self) -> float:
+        """When idle time starts counting: the last query's end, or startup if none ran."""
+        return self.startup_time if self.last_query_end_time == 0.0 else self.last_query_end_time
     
     def is_active(self, current_time: float, idle_timeout: float) -> bool:
         """Check if cluster is still active and available for queries."""
-        # Check if cluster has been shut down
-        if self.shutdown_time is not None and current_time >= self.shutdown_time:
-            return False
-        
-        # Cluster with active queries is always active
-        if self.active_queries > 0:
-            return True
-        
-        # For idle clusters, check how long they've been idle
-        # If never processed a query, check idle time from startup
-        if self.last_query_end_time == 0.0:
-            idle_time = current_time - self.startup_time
-        else:
-            idle_time = current_time - self.last_query_end_time
-        
-        # Cluster is active if idle time is within timeout
-        return idle_time < idle_timeout
+        # Active until shut down, as long as it is busy or has been idle for
+        # less than the timeout
+        return current_time < self.shutdown_time and (
+            self.active_queries > 0 or current_time - self.idle_since < idle_timeout
+        )
     
     def utilization(self, target_concurrency: int) -> float:
         """Calculate current utilization as fraction of target concurrency."""
@@ -45,7 +56,7 @@ class ClusterState:
         return self.active_queries / target_concurrency
 
 
-@dataclass
+@dataclass(slots=True)
 class WarehouseState:
     """State of the entire warehouse at a point in time."""
     
@@ -64,26 +75,158 @@ class WarehouseState:
         return self.active_queries / self.total_capacity
 
 
+# Row layout of StateHistory, one field per WarehouseState attribute
+WAREHOUSE_STATE_DTYPE = np.dtype([
+    ('time', 'f8'),
+    ('num_clusters', 'i4'),
+    ('active_queries', 'i4'),
+    ('queued_queries', 'i4'),
+    ('total_capacity', 'i4'),
+    ('dbu_consumption', 'f8'),
+    ('genai_dbu_consumption', 'f8'),
+])
+
+
+class StateHistory:
+    """
+    Recorded warehouse states, stored as rows of a NumPy structured array.
+    
+    Reads like a list of WarehouseState (len, indexing, iteration), building
+    each WarehouseState on access; records exposes the rows themselves.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Number of rows to preallocate; the array doubles in
+                size whenever it fills up
+        """
+        self._rows = np.empty(max(capacity, 1), dtype=WAREHOUSE_STATE_DTYPE)
+        self._size = 0
+    
+    @classmethod
+    def from_states(cls, states: Iterable[WarehouseState]) -> "StateHistory":
+        """Build a history holding states, in order."""
+        states = list(states)
+        history = cls(len(states))
+        for state in states:
+            history.append(state)
+        return history
+    
+    def _reserve(self, count: int):
+        """Make room for count more rows, doubling the array as often as needed."""
+        needed = self._size + count
+        if needed > len(self._rows):
+            capacity = len(self._rows)
+            while capacity < needed:
+                capacity *= 2
+            rows = np.empty(capacity, dtype=WAREHOUSE_STATE_DTYPE)
+            rows[:self._size] = self._rows[:self._size]
+            self._rows = rows
+    
+    def append(self, state: WarehouseState):
+        """Store state in the next row."""
+        self.append_row(
+            state.time, state.num_clusters, state.active_queries, state.queued_queries,
+            state.total_capacity, state.dbu_consumption, state.genai_dbu_consumption
+        )
+    
+    def append_row(self, time: float, num_clusters: int, active_queries: int, queued_queries: int,
+                   total_capacity: int, dbu_consumption: float = 0.0, genai_dbu_consumption: float = 0.0):
+        """Store a state given as its field values, without building a WarehouseState."""
+        self._reserve(1)
+        self._rows[self._size] = (
+            time, num_clusters, active_queries, queued_queries,
+            total_capacity, dbu_consumption, genai_dbu_consumption
+        )
+        self._size += 1
+    
+    @property
+    def records(self) -> np.ndarray:
+        """Recorded rows as a structured array (a view, not a copy)."""
+        return self._rows[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[WarehouseState, List[WarehouseState]]:
+        if isinstance(index, slice):
+            return [WarehouseState(*values) for values in self.records[index].tolist()]
+        return WarehouseState(*self.records[index].item())
+    
+    def __iter__(self) -> Iterator[WarehouseState]:
+        for values in self.records.tolist():
+            yield WarehouseState(*values)
+
+
 class ServerlessWarehouse:
     """
     Simulates a Databricks Serverless SQL Warehouse with autoscaling.
     """
     
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, history_capacity: int = 1024):
+        """
+        Args:
+            config: Simulation configuration
+            history_capacity: Number of recorded states to preallocate room
+                for (the history grows past it if needed)
+        """
         self.config = config
-        self.clusters: List[ClusterState] = []
+        
+        # Warehouse settings read on every step, copied out of the config once
+        warehouse = config.warehouse
+        self._min_clusters = warehouse.min_clusters
+        self._max_clusters = warehouse.max_clusters
+        self._concurrency_per_cluster = warehouse.effective_concurrency_per_cluster
+        self._idle_timeout = warehouse.idle_shutdown_seconds
+        self._scale_up_delay = warehouse.scale_up_delay_seconds
+        self._scale_down_delay = warehouse.scale_down_delay_seconds
+        # With min_clusters == max_clusters the warehouse never scales: it
+        # keeps its starting clusters, and idle ones are never removed
+        self._fixed_size = self._min_clusters == self._max_clusters
+        
+        # Live clusters by cluster_id, in the order they were added
+        self.clusters: Dict[int, ClusterState] = {}
         self.cluster_counter = 0
         
+        # Running totals over self.clusters, kept up to date as queries are
+        # assigned and released and clusters come and go
+        self._active_queries_total = 0
+        self._capacity_total = 0
+        
+        # Lower bounds on the idle_since of any idle cluster and on the
+        # shutdown times, so update_state only looks for clusters to remove
+        # once one could actually have expired
+        self._earliest_idle_since = math.inf
+        self._earliest_shutdown = math.inf
+        
+        # Idle clusters past the timeout that are only kept to honor
+        # min_clusters; they are left out of _earliest_idle_since
+        self._num_retained_idle = 0
+        
         # Start with minimum clusters
-        for _ in range(self.config.warehouse.min_clusters):
+        for _ in range(self._min_clusters):
             self._add_cluster(startup_time=0.0)
         
         # Scaling state
         self.last_scale_up_time = 0.0
         self.last_scale_down_time = 0.0
+        # Earliest times the next scale-up / scale-down may happen
+        self._next_scale_up_time = _cooldown_end(0.0, self._scale_up_delay)
+        self._next_scale_down_time = _cooldown_end(0.0, self._scale_down_delay)
+        
+        # Utilization thresholds as fractions (denominators up to 10,000), so
+        # the scaling checks compare cross-multiplied integers, not a quotient
+        up = Fraction(warehouse.scale_up_threshold).limit_denominator(10_000)
+        down = Fraction(warehouse.scale_down_threshold).limit_denominator(10_000)
+        self._up_num, self._up_den = up.numerator, up.denominator
+        self._down_num, self._down_den = down.numerator, down.denominator
+        
+        # Billing rate of one cluster, per second
+        self._dbus_per_cluster_second = warehouse.dbus_per_hour / 3600.0
         
         # Metrics tracking
-        self.state_history: List[WarehouseState] = []
+        self.state_history = StateHistory(history_capacity)
     
     def _add_cluster(self, startup_time: float) -> ClusterState:
         """Add a new cluster to the warehouse."""
@@ -91,8 +234,14 @@ class ServerlessWarehouse:
             cluster_id=self.cluster_counter,
             startup_time=startup_time
         )
-        self.clusters.append(cluster)
+        self.clusters[cluster.cluster_id] = cluster
         self.cluster_counter += 1
+        self._capacity_total += self._concurrency_per_cluster
+        self._earliest_idle_since = min(self._earliest_idle_since, startup_time)
+        if self._num_retained_idle:
+            # A new cluster may leave a retained idle cluster surplus to
+            # min_clusters, so look for clusters to remove on the next update
+            self._earliest_idle_since = -math.inf
         return cluster
     
     def _remove_idle_clusters(self, current_time: float):
@@ -100,19 +249,34 @@ class ServerlessWarehouse:
         active_clusters = []
         inactive_clusters = []
         
-        for cluster in self.clusters:
-            if cluster.is_active(current_time, self.config.warehouse.idle_shutdown_seconds):
+        for cluster in self.clusters.values():
+            if cluster.is_active(current_time, self._idle_timeout):
                 active_clusters.append(cluster)
             else:
                 inactive_clusters.append(cluster)
         
-        # Always keep at least min_clusters, even if idle
-        clusters_to_keep = active_clusters
-        if len(active_clusters) < self.config.warehouse.min_clusters:
-            needed = self.config.warehouse.min_clusters - len(active_clusters)
-            clusters_to_keep.extend(inactive_clusters[:needed])
-        
-        self.clusters = clusters_to_keep
+        retained = []
+        if inactive_clusters:
+            # Always keep at least min_clusters, even if idle
+            if len(active_clusters) < self._min_clusters:
+                needed = self._min_clusters - len(active_clusters)
+                retained = inactive_clusters[:needed]
+                inactive_clusters = inactive_clusters[needed:]
+            
+            self.clusters = {c.cluster_id: c for c in active_clusters + retained}
+            if inactive_clusters:
+                self._active_queries_total -= sum(c.active_queries for c in inactive_clusters)
+                self._capacity_total = len(self.clusters) * self._concurrency_per_cluster
+        
+        # Tighten the expiry bounds to the clusters that remain. Retained
+        # clusters have already expired and would keep the bound expired, so
+        # they are left out; they only become removable when a cluster is
+        # added (see _add_cluster) or, once they run a query, via release_query
+        self._num_retained_idle = len(retained)
+        self._earliest_idle_since = min(
+            (c.idle_since for c in active_clusters if c.active_queries == 0), default=math.inf
+        )
+        self._earliest_shutdown = min((c.shutdown_time for c in self.clusters.values()), default=math.inf)
     
     def _should_scale_up(self, current_time: float) -> bool:
         """
@@ -123,25 +287,25 @@ class ServerlessWarehouse:
         - Current utilization exceeds threshold
         - Haven't scaled up too recently
         """
-        if len(self.clusters) >= self.config.warehouse.max_clusters:
+        if len(self.clusters) >= self._max_clusters:
             return False
         
         # Auto-resume: if no clusters exist, scale up immediately (Serverless behavior)
         if len(self.clusters) == 0:
             return True
         
-        if current_time - self.last_scale_up_time < self.config.warehouse.scale_up_delay_seconds:
+        if current_time < self._next_scale_up_time:
             return False
         
         # Check overall utilization
-        total_capacity = len(self.clusters) * self.config.warehouse.effective_concurrency_per_cluster
-        active_queries = sum(c.active_queries for c in self.clusters)
+        total_capacity = self._capacity_total
+        active_queries = self._active_queries_total
         
         if total_capacity == 0:
             return False
         
-        utilization = active_queries / total_capacity
-        return utilization >= self.config.warehouse.scale_up_threshold
+        # utilization >= scale_up_threshold
+        return active_queries * self._up_den >= total_capacity * self._up_num
     
     def _should_scale_down(self, current_time: float) -> bool:
         """
@@ -157,44 +321,43 @@ class ServerlessWarehouse:
         should only happen via idle timeout, not scale-down logic.
         """
         # Don't scale down if at or below minimum clusters
-        if len(self.clusters) <= self.config.warehouse.min_clusters:
+        if len(self.clusters) <= self._min_clusters:
             return False
         
         # For serverless (min_clusters=0), don't scale down the last cluster
         # Let idle timeout handle scaling to zero instead
-        if self.config.warehouse.min_clusters == 0 and len(self.clusters) == 1:
+        if self._min_clusters == 0 and len(self.clusters) == 1:
             return False
         
-        if current_time - self.last_scale_down_time < self.config.warehouse.scale_down_delay_seconds:
+        if current_time < self._next_scale_down_time:
             return False
         
         # Check overall utilization
-        total_capacity = len(self.clusters) * self.config.warehouse.effective_concurrency_per_cluster
-        active_queries = sum(c.active_queries for c in self.clusters)
+        total_capacity = self._capacity_total
+        active_queries = self._active_queries_total
         
         if total_capacity == 0:
             return False
         
-        utilization = active_queries / total_capacity
-        return utilization <= self.config.warehouse.scale_down_threshold
+        # utilization <= scale_down_threshold
+        return active_queries * self._down_den <= total_capacity * self._down_num
     
     def _scale_up(self, current_time: float):
         """Add a new cluster."""
         self._add_cluster(startup_time=current_time)
         self.last_scale_up_time = current_time
+        self._next_scale_up_time = _cooldown_end(current_time, self._scale_up_delay)
     
     def _scale_down(self, current_time: float):
         """Remove an idle cluster."""
-        # Find cluster with fewest active queries
-        if not self.clusters:
-            return
-        
-        least_busy_cluster = min(self.clusters, key=lambda c: c.active_queries)
-        
-        # Only scale down if the cluster has no active queries
-        if least_busy_cluster.active_queries == 0:
-            least_busy_cluster.shutdown_time = current_time
+        # Only scale down a cluster with no active queries; the first one is
+        # the least busy cluster (ties go to the first)
+        idle_cluster = next((c for c in self.clusters.values() if c.active_queries == 0), None)
+        if idle_cluster is not None:
+            idle_cluster.shutdown_time = current_time
+            self._earliest_shutdown = min(self._earliest_shutdown, current_time)
             self.last_scale_down_time = current_time
+            self._next_scale_down_time = _cooldown_end(current_time, self._scale_down_delay)
     
     def assign_query(self, current_time: float) -> Tuple[bool, ClusterState]:
         """
@@ -204,21 +367,30 @@ class ServerlessWarehouse:
             Tuple of (success, cluster) where success indicates if query was assigned
         """
         # Check for scaling needs
-        if self._should_scale_up(current_time):
+        if not self._fixed_size and self._should_scale_up(current_time):
             self._scale_up(current_time)
         
-        # Try to assign to existing cluster with capacity
-        # Any cluster that's not shut down and has capacity can accept queries
-        available_clusters = [
-            c for c in self.clusters
-            if c.active_queries < self.config.warehouse.effective_concurrency_per_cluster
-            and (c.shutdown_time is None or current_time < c.shutdown_time)
-        ]
-        
-        if available_clusters:
-            # Assign to cluster with fewest active queries (load balance)
-            cluster = min(available_clusters, key=lambda c: c.active_queries)
+        # No cluster ever runs more than its concurrency limit, so when the
+        # totals meet every cluster is full and there is nothing to scan
+        if self._active_queries_total >= self._capacity_total:
+            return False, None
+        
+        # Try to assign to existing cluster with capacity, picking the one
+        # with fewest active queries (load balance; the first on ties). Any
+        # cluster that's not shut down and has capacity can accept queries
+        least_active = self._concurrency_per_cluster
+        cluster = None
+        for c in self.clusters.values():
+            if c.active_queries < least_active and current_time < c.shutdown_time:
+                cluster = c
+                least_active = c.active_queries
+                if least_active == 0:
+                    # Nothing can beat an idle cluster, and ties keep the first
+                    break
+        
+        if cluster is not None:
             cluster.active_queries += 1
+            self._active_queries_total += 1
             return True, cluster
         
         # All clusters at capacity - query will queue
@@ -226,19 +398,67 @@ class ServerlessWarehouse:
     
     def release_query(self, cluster: ClusterState, end_time: float):
         """Release a query from a cluster."""
-        if cluster and cluster in self.clusters:
-            cluster.active_queries = max(0, cluster.active_queries - 1)
+        if cluster is not None and cluster.cluster_id in self.clusters:
+            if cluster.active_queries > 0:
+                cluster.active_queries -= 1
+                self._active_queries_total -= 1
             cluster.last_query_end_time = end_time
+            self._earliest_idle_since = min(self._earliest_idle_since, end_time)
     
     def update_state(self, current_time: float):
         """Update warehouse state and perform scaling decisions."""
-        # Remove idle clusters
-        self._remove_idle_clusters(current_time)
+        # A fixed-size warehouse has no scaling decisions to make
+        if self._fixed_size:
+            return
+        
+        # Remove idle clusters, once one can have reached its shutdown time or
+        # been idle for the full timeout (the expiry bounds say when)
+        if (current_time >= self._earliest_shutdown
+                or current_time - self._earliest_idle_since >= self._idle_timeout):
+            self._remove_idle_clusters(current_time)
         
         # Check for scale down
         if self._should_scale_down(current_time):
             self._scale_down(current_time)
     
+    def next_state_change(self, current_time: float) -> float:
+        """
+        Earliest time after current_time at which update_state could change
+        the warehouse, assuming no queries arrive or complete before then.
+        
+        Used by the simulator to skip time steps where nothing happens.
+        
+        Args:
+            current_time: Current simulation time (update_state has already
+                run for this time)
+        
+        Returns:
+            Time of the next possible change, or inf if there is none
+        """
+        if self._fixed_size:
+            return math.inf
+        
+        next_change = math.inf
+        
+        for cluster in self.clusters.values():
+            # Clusters scaled down at current_time are removed on the next step
+            if current_time <= cluster.shutdown_time < math.inf:
+                next_change = min(next_change, cluster.shutdown_time)
+            
+            # Idle clusters shut down once the idle timeout elapses; clusters
+            # already past it are only still here to honor min_clusters
+            if cluster.active_queries == 0:
+                idle_until = cluster.idle_since + self._idle_timeout
+                if idle_until > current_time:
+                    next_change = min(next_change, idle_until)
+        
+        # A scale-down held back by the delay may go ahead once it expires
+        scale_down_at = self._next_scale_down_time
+        if scale_down_at > current_time:
+            next_change = min(next_change, scale_down_at)
+        
+        return next_change
+    
     def calculate_dbu_consumption(self, time_delta_seconds: float) -> float:
         """
         Calculate DBU consumption for the given time period.
@@ -251,15 +471,8 @@ class ServerlessWarehouse:
         Returns:
             DBU consumption for this period
         """
-        # Count active clusters
-        active_clusters = len(self.clusters)
-        
-        # Calculate DBUs
-        # DBUs = (DBUs per hour per cluster) * (number of clusters) * (hours)
-        hours = time_delta_seconds / 3600.0
-        dbus = self.config.warehouse.dbus_per_hour * active_clusters * hours
-        
-        return dbus
+        # DBUs = (DBUs per second per cluster) * (number of clusters) * (seconds)
+        return self._dbus_per_cluster_second * len(self.clusters) * time_delta_seconds
     
     def get_state(self, current_time: float, queued_queries: int = 0) -> WarehouseState:
         """
@@ -272,22 +485,21 @@ class ServerlessWarehouse:
         Returns:
             WarehouseState object
         """
-        active_queries = sum(c.active_queries for c in self.clusters)
-        total_capacity = len(self.clusters) * self.config.warehouse.effective_concurrency_per_cluster
-        
         return WarehouseState(
             time=current_time,
             num_clusters=len(self.clusters),
-            active_queries=active_queries,
+            active_queries=self._active_queries_total,
             queued_queries=queued_queries,
-            total_capacity=total_capacity
+            total_capacity=self._capacity_total
         )
     
     def record_state(self, current_time: float, queued_queries: int = 0, 
                      dbu_consumption: float = 0.0, genai_dbu_consumption: float = 0.0):
         """Record current state for metrics."""
-        state = self.get_state(current_time, queued_queries)
-        state.dbu_consumption = dbu_consumption
-        state.genai_dbu_consumption = genai_dbu_consumption
-        self.state_history.append(state)
+        # Written straight into the history; a WarehouseState is only built
+        # when the history is read
+        self.state_history.append_row(
+            current_time, len(self.clusters), self._active_queries_total, queued_queries,
+            self._capacity_total, dbu_consumption, genai_dbu_consumption
+        )
 